@@ -35,6 +35,7 @@ def setup_logging(log_level: str = "info") -> None:
 
     structlog.configure(
         processors=[
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
@@ -56,12 +57,14 @@ logger = structlog.get_logger(__name__)
 
 # Global reference to Slack bot handler
 slack_handler: Optional[AsyncSocketModeHandler] = None
+# Global reference to the SlackBot itself (imported lazily), closed on shutdown
+slack_bot = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle - start/stop Slack bot with the server."""
-    global slack_handler
+    global slack_handler, slack_bot
 
     # Startup
     if settings.enable_slack_bot and settings.is_slack_bot_configured():
@@ -70,14 +73,14 @@ async def lifespan(app: FastAPI):
 
             logger.info("initializing_jarvis_bot")
 
-            bot = SlackBot(
+            slack_bot = SlackBot(
                 slack_bot_token=settings.slack_bot_token,
                 slack_signing_secret=settings.slack_signing_secret,
                 slack_app_token=settings.slack_app_token,
                 anthropic_api_key=settings.anthropic_api_key,
             )
 
-            slack_handler = AsyncSocketModeHandler(bot.app, settings.slack_app_token)
+            slack_handler = AsyncSocketModeHandler(slack_bot.app, settings.slack_app_token)
 
             # Start the Slack bot in a background task
             asyncio.create_task(slack_handler.start_async())
@@ -104,6 +107,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error("jarvis_bot_shutdown_error", error=str(e))
 
+    if slack_bot:
+        try:
+            await slack_bot.aclose()
+        except Exception as e:
+            logger.error("jarvis_bot_close_error", error=str(e))
+
 
 app = FastAPI(
     title="Schumacher Ads Dashboard API",
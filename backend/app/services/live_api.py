@@ -6,10 +6,11 @@ with custom date ranges from Meta, Google Ads, and LinkedIn.
 """
 
 import asyncio
+import contextlib
 import os
 import httpx
 import structlog
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -247,9 +248,43 @@ def get_account_id_from_query(query: str) -> str:
 class LiveAPIService:
     """Service for fetching live data from ad platform APIs."""
 
-    def __init__(self, meta_access_token: Optional[str] = None):
-        """Initialize with API credentials."""
+    def __init__(self, meta_access_token: Optional[str] = None, pooled: bool = False):
+        """
+        Initialize with API credentials.
+
+        Args:
+            meta_access_token: Meta Graph API token (falls back to META_ACCESS_TOKEN).
+            pooled: Keep one HTTP client, and its connections to the Meta API,
+                open between calls. For long-lived instances (e.g. the Slack
+                bot), which must call aclose() when done.
+        """
         self.meta_token = meta_access_token or os.getenv("META_ACCESS_TOKEN")
+        self._client: Optional[httpx.AsyncClient] = (
+            httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+            if pooled
+            else None
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled client, if this instance keeps one."""
+        if self._client is not None:
+            await self._client.aclose()
+
+    @contextlib.asynccontextmanager
+    async def _http(self) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Yield the HTTP client for a method's Meta API calls.
+
+        Pooled instances reuse their long-lived client; others open one for
+        the duration of the call. Timeouts are set on each request.
+        """
+        if self._client is not None:
+            yield self._client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
 
     async def get_meta_account_insights(
         self,
@@ -297,8 +332,8 @@ class LiveAPIService:
         url = f"{META_API_BASE}/{account_id}/insights"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
+            async with self._http() as client:
+                response = await client.get(url, params=params, timeout=30.0)
                 response.raise_for_status()
                 data = response.json()
 
@@ -364,7 +399,7 @@ class LiveAPIService:
         ]
 
         # Also pull campaign-level metadata (status, budget) separately
-        async with httpx.AsyncClient(timeout=45.0) as client:
+        async with self._http() as client:
             try:
                 # 1. Insights for the requested date range
                 insights_resp = await client.get(
@@ -375,7 +410,8 @@ class LiveAPIService:
                         "time_range": f'{{"since":"{date_range.start_date}","until":"{date_range.end_date}"}}',
                         "level": "campaign",
                         "limit": 200,
-                    }
+                    },
+                    timeout=45.0,
                 )
                 insights_resp.raise_for_status()
                 insights_data = insights_resp.json()
@@ -394,7 +430,8 @@ class LiveAPIService:
                             "value": ["ACTIVE", "PAUSED"],
                         }]),
                         "limit": 200,
-                    }
+                    },
+                    timeout=45.0,
                 )
                 meta_resp.raise_for_status()
                 campaign_meta = {
@@ -473,7 +510,7 @@ class LiveAPIService:
         }])
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self._http() as client:
                 # Step 1: collect active campaign IDs
                 campaign_ids: set = set()
                 url: str | None = f"{META_API_BASE}/{account_id}/campaigns"
@@ -484,7 +521,7 @@ class LiveAPIService:
                     "limit": 200,
                 }
                 while url:
-                    resp = await client.get(url, params=params)
+                    resp = await client.get(url, params=params, timeout=60.0)
                     resp.raise_for_status()
                     data = resp.json()
                     for c in data.get("data", []):
@@ -509,7 +546,7 @@ class LiveAPIService:
                     "limit": 500,
                 }
                 while url:
-                    resp = await client.get(url, params=params)
+                    resp = await client.get(url, params=params, timeout=60.0)
                     resp.raise_for_status()
                     data = resp.json()
                     for ad in data.get("data", []):
@@ -605,7 +642,7 @@ class LiveAPIService:
         async def paginate(client: httpx.AsyncClient, url: str, params: dict) -> List[dict]:
             results = []
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, timeout=60.0)
                 resp.raise_for_status()
                 data = resp.json()
                 results.extend(data.get("data", []))
@@ -651,7 +688,7 @@ class LiveAPIService:
         preset_field = "insights.date_preset(last_30_days){spend,impressions,clicks,ctr,cpc,actions}"
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self._http() as client:
                 try:
                     # 1. Try with explicit time_range (supports custom date ranges)
                     campaigns_raw, adsets_raw, ads_raw = await _fetch_tree(client, time_range_field)
@@ -783,8 +820,8 @@ class LiveAPIService:
         url = f"{META_API_BASE}/{account_id}/insights"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, params=params)
+            async with self._http() as client:
+                response = await client.get(url, params=params, timeout=30.0)
                 response.raise_for_status()
                 data = response.json()
 
@@ -981,7 +1018,7 @@ class LiveAPIService:
         async def paginate(client: httpx.AsyncClient, url: str, params: dict) -> List[dict]:
             results = []
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, timeout=90.0)
                 resp.raise_for_status()
                 data = resp.json()
                 results.extend(data.get("data", []))
@@ -990,7 +1027,7 @@ class LiveAPIService:
             return results
 
         try:
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with self._http() as client:
                 # Fetch ad-level insights for the date window
                 ads_insights = await paginate(client, f"{META_API_BASE}/{account_id}/insights", {
                     "access_token": self.meta_token,
@@ -1281,7 +1318,7 @@ class LiveAPIService:
         async def paginate(client: httpx.AsyncClient, url: str, params: dict) -> List[dict]:
             results = []
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, timeout=90.0)
                 resp.raise_for_status()
                 data = resp.json()
                 results.extend(data.get("data", []))
@@ -1290,7 +1327,7 @@ class LiveAPIService:
             return results
 
         try:
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with self._http() as client:
                 # Only fetch one page (500 ads max) sorted by updated_time desc
                 # so the most recently paused ads come first — no need to paginate
                 # through thousands of old paused ads.
@@ -1305,7 +1342,7 @@ class LiveAPIService:
                     "filtering": paused_filter,
                     "sort": "updated_time_descending",
                     "limit": 500,
-                })
+                }, timeout=90.0)
                 resp.raise_for_status()
                 ads_raw = resp.json().get("data", [])
 
@@ -1586,7 +1623,7 @@ class LiveAPIService:
         async def paginate(client: httpx.AsyncClient, url: str, params: dict) -> List[dict]:
             results = []
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, timeout=60.0)
                 resp.raise_for_status()
                 data = resp.json()
                 results.extend(data.get("data", []))
@@ -1595,7 +1632,7 @@ class LiveAPIService:
             return results
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with self._http() as client:
                 ads_raw = await paginate(client, f"{META_API_BASE}/{account_id}/ads", {
                     "access_token": self.meta_token,
                     "fields": (
@@ -1,6 +1,15 @@
 """JARVIS Slack Bot module for paid media intelligence."""
 
-from .bot import SlackBot
-from .analyst import AnthropicAnalyst
-
 __all__ = ["SlackBot", "AnthropicAnalyst"]
+
+
+def __getattr__(name: str):
+    # Resolved on first access so importing a submodule (e.g. the analyst
+    # from the chat router) doesn't drag in slack_bolt and the whole bot
+    if name == "SlackBot":
+        from .bot import SlackBot
+        return SlackBot
+    if name == "AnthropicAnalyst":
+        from .analyst import AnthropicAnalyst
+        return AnthropicAnalyst
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import anthropic
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import structlog
 
@@ -210,10 +210,37 @@ Tone and Style:
 - For creative feedback: evaluate the concept through the lens of the funnel stage, audience psychology, and what the data says about what resonates for Schumacher Homes specifically (custom home builders targeting mid-to-upper income homebuyers).
 - Keep responses concise and scannable. Use headers and bullets. Avoid walls of text."""
 
+# Prompt caching: the system prompt is identical on every call, so it is sent
+# as a cached block. Other breakpoints are only placed on content long enough
+# to be worth caching (Anthropic ignores prefixes under ~1024 tokens).
+_CACHE_CONTROL = {"type": "ephemeral"}
+_MIN_CACHE_CHARS = 4096  # ~1024 tokens
+
+_SYSTEM_BLOCKS = [
+    {"type": "text", "text": ANALYST_SYSTEM_PROMPT, "cache_control": _CACHE_CONTROL},
+]
+
+
+def _text_block(text: str, cache: bool = False) -> Dict[str, Any]:
+    """Build a text content block, optionally marked as a cache breakpoint."""
+    block: Dict[str, Any] = {"type": "text", "text": text}
+    if cache:
+        block["cache_control"] = _CACHE_CONTROL
+    return block
+
+
+def _table_cell(value: Any) -> str:
+    """Render a value for a Markdown table cell, escaping pipes in names."""
+    return str(value).replace("|", "\\|")
+
 
 class AnthropicAnalyst:
     """AI analyst powered by Anthropic's Claude for paid media strategy."""
 
+    # Upper bound (characters) on the additional context sent with a query —
+    # roughly 50k tokens, leaving room for the system prompt and history
+    max_context_chars = 200_000
+
     def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
         """
         Initialize the Anthropic client.
@@ -259,7 +286,7 @@ class AnthropicAnalyst:
         performance_data: Dict[str, Any],
         user_query: str,
         additional_context: Optional[str] = None,
-        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_history: Optional[Sequence[Dict[str, str]]] = None,
     ) -> str:
         """
         Analyze performance data and generate strategic recommendations.
@@ -280,24 +307,34 @@ class AnthropicAnalyst:
         # Build the current turn's user message.
         # Live API data and uploaded file contents go in additional_context —
         # they're injected fresh each turn so history stays clean (just Q&A).
+        # Data comes first and the query last, so the (large) data block can
+        # be cached and re-used when the same data is asked about again.
         data_summary = self._format_performance_data(performance_data)
 
-        prompt_parts = []
+        context_parts = []
         if data_summary and data_summary != "No performance data available.":
-            prompt_parts.append(f"## Current Performance Data\n{data_summary}")
-
-        prompt_parts.append(f"## User Request\n{user_query}")
+            context_parts.append(f"## Current Performance Data\n{data_summary}")
 
         if additional_context:
-            prompt_parts.append(f"## Live Data & Context\n{additional_context}")
+            context_parts.append(f"## Live Data & Context\n{additional_context}")
 
-        prompt = "\n\n".join(prompt_parts)
+        content = []
+        if context_parts:
+            context = "\n\n".join(context_parts)
+            content.append(_text_block(context, cache=len(context) >= _MIN_CACHE_CHARS))
+        content.append(_text_block(f"## User Request\n{user_query}"))
 
         # Use the per-thread history passed in from the bot.
         # Fall back to the instance-level list only if nothing was passed
         # (backward-compat for any direct callers).
         history = conversation_history if conversation_history is not None else self._conversation_context
-        messages = list(history) + [{"role": "user", "content": prompt}]
+        messages = list(history)
+        if messages and messages[-1]["content"]:
+            # Prior Q&A never changes once written, so cache up to the end of it.
+            # Empty turns are left alone: the API rejects empty text blocks.
+            last = messages[-1]
+            messages[-1] = {"role": last["role"], "content": [_text_block(last["content"], cache=True)]}
+        messages.append({"role": "user", "content": content})
 
         logger.info(
             "requesting_analysis",
@@ -310,7 +347,7 @@ class AnthropicAnalyst:
             return self.client.messages.create(
                 model=self.model,
                 max_tokens=4096,
-                system=ANALYST_SYSTEM_PROMPT,
+                system=_SYSTEM_BLOCKS,
                 messages=messages,
             )
 
@@ -362,7 +399,7 @@ Please provide an optimized budget allocation with clear reasoning for each reco
             return self.client.messages.create(
                 model=self.model,
                 max_tokens=4096,
-                system=ANALYST_SYSTEM_PROMPT,
+                system=_SYSTEM_BLOCKS,
                 messages=messages,
             )
 
@@ -388,17 +425,24 @@ Please provide an optimized budget allocation with clear reasoning for each reco
             lines.append("")
 
         if "campaigns" in data:
+            # One table row per campaign, so metric labels appear once
+            # instead of being repeated for every campaign
             lines.append("### Campaign Performance")
+            lines.append("| Campaign | Platform | Status | Spend | Impressions | Clicks | Leads | CPL | CTR |")
+            lines.append("|---|---|---|---|---|---|---|---|---|")
             for campaign in data["campaigns"]:
-                lines.append(f"**{campaign.get('name', 'Unknown')}** ({campaign.get('platform', 'Meta')})")
-                lines.append(f"  - Status: {campaign.get('status', 'Unknown')}")
-                lines.append(f"  - Spend: ${campaign.get('spend', 0):,.2f}")
-                lines.append(f"  - Impressions: {campaign.get('impressions', 0):,}")
-                lines.append(f"  - Clicks: {campaign.get('clicks', 0):,}")
-                lines.append(f"  - Leads: {campaign.get('leads', 0):,}")
-                lines.append(f"  - Cost per Lead: ${campaign.get('cost_per_lead', 0):.2f}")
-                lines.append(f"  - CTR: {campaign.get('ctr', 0):.2f}%")
-                lines.append("")
+                lines.append(
+                    f"| {_table_cell(campaign.get('name', 'Unknown'))} "
+                    f"| {_table_cell(campaign.get('platform', 'Meta'))} "
+                    f"| {_table_cell(campaign.get('status', 'Unknown'))} "
+                    f"| ${campaign.get('spend', 0):,.2f} "
+                    f"| {campaign.get('impressions', 0):,} "
+                    f"| {campaign.get('clicks', 0):,} "
+                    f"| {campaign.get('leads', 0):,} "
+                    f"| ${campaign.get('cost_per_lead', 0):.2f} "
+                    f"| {campaign.get('ctr', 0):.2f}% |"
+                )
+            lines.append("")
 
         if "platforms" in data:
             lines.append("### Platform Summary")
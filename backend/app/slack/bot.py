@@ -7,17 +7,32 @@ AI-powered paid media analysis via Slack.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import hashlib
 import re
-from typing import Any, Dict, List, Optional
+import tempfile
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from slack_bolt.async_app import AsyncApp
 from slack_sdk.web.async_client import AsyncWebClient
+import aiohttp
 import httpx
 import structlog
+from structlog.contextvars import bound_contextvars
 
 from .analyst import AnthropicAnalyst
 from .file_processor import FileProcessor
-from .utils import parse_budget_table_from_response, clean_response_for_slack, generate_reports
+from .utils import (
+    parse_and_clean_response,
+    generate_csv_buffer,
+    join_within_budget,
+    to_json_text,
+    truncate_text,
+    truncated_json,
+)
 from app.services.meta_ads import MetaAdsService
 from app.services.live_api import (
     LiveAPIService,
@@ -29,6 +44,221 @@ from app.config import get_settings
 
 logger = structlog.get_logger(__name__)
 
+# Slack message parsing
+_MENTION_RE = re.compile(r"<@[A-Z0-9]+>")
+_CONTEXT_RE = re.compile(r"context:\s*(.+)", re.IGNORECASE)
+_CLEAR_COMMANDS = frozenset({"clear context", "reset", "start over"})
+
+# Slack downloads are streamed in chunks of this size and spooled to memory,
+# rolling over to a temp file on disk once they exceed _DOWNLOAD_SPOOL_BYTES.
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+_DOWNLOAD_SPOOL_BYTES = 4 * 1024 * 1024
+
+# Status-bar updates arriving within this window are coalesced into one chat.update
+_STATUS_DEBOUNCE_SECONDS = 0.75
+
+# Loading bar segments — only _BAR_WIDTH + 1 distinct bars exist, so build them once
+_BAR_FILL = "█"
+_BAR_EMPTY = "░"
+_BAR_WIDTH = 10
+_STATUS_BARS = tuple(
+    _BAR_FILL * filled + _BAR_EMPTY * (_BAR_WIDTH - filled)
+    for filled in range(_BAR_WIDTH + 1)
+)
+
+# Claude calls allowed in flight at once; further analyses wait their turn
+# instead of tripping Anthropic rate limits together
+_MAX_CONCURRENT_ANALYSES = 4
+
+# Dashboard fallback data is global, so bursts of mentions can share one fetch
+_DASHBOARD_CACHE_TTL_SECONDS = 30
+
+# Per-thread context retention: idle threads expire, the least recently
+# used are evicted past the cap, and each keeps only its latest uploads
+# (every kept upload is re-sent with each question in the thread)
+_THREAD_CONTEXT_TTL_SECONDS = 6 * 60 * 60
+_THREAD_CONTEXT_MAX_ENTRIES = 512
+_MAX_THREAD_FILES = 5
+_MAX_THREAD_USER_CONTEXT = 20
+
+# Pipeline stages shown in the loading message, and the fixed state
+# overrides applied as each stage completes
+_STEP_ACCOUNT = "Account & campaign data"
+_STEP_PAUSED = "Paused ads history"
+_STEP_INVENTORY = "Active ads inventory"
+_STEP_LOOKUP = "Ad-level creative data"
+_STEP_THINKING = "Thinking…"
+
+_STAGE1_DONE: Dict[str, Dict[str, str]] = {
+    step: {_STEP_ACCOUNT: "done", step: "active"}
+    for step in (_STEP_PAUSED, _STEP_INVENTORY, _STEP_LOOKUP, _STEP_THINKING)
+}
+_STAGE2_DONE: Dict[str, Dict[str, str]] = {
+    step: {_STEP_ACCOUNT: "done", step: "done", _STEP_THINKING: "active"}
+    for step in (_STEP_PAUSED, _STEP_INVENTORY, _STEP_LOOKUP)
+}
+
+# Per-sheet budget for spreadsheet rows in the prompt (wide sheets get fewer rows)
+_SHEET_CONTEXT_BYTES = 4 * 1024
+
+# Characters of an uploaded document's (whitespace-compacted) text included in the prompt
+_DOCUMENT_CONTEXT_CHARS = 4000
+# Encoded size of a non-tabular JSON upload included in the prompt
+_JSON_CONTEXT_BYTES = 16 * 1024
+# Raw-record excerpt for upload types without a dedicated renderer
+_UNKNOWN_FILE_CONTEXT_BYTES = 1024
+
+# Pipe-delimited ad names: sentence prefix before the name ("...these ads: ")
+# and the phrase following a preposition/verb in a still-long first segment
+_AD_NAME_PREFIX_RE = re.compile(
+    r"[:]\s*|(?:ads?|these|those|following|creatives?)\s+", re.IGNORECASE
+)
+_AD_NAME_PHRASE_RE = re.compile(
+    r"(?:of|for|on|about|check|pull|get|show|see)\s+(.+)$", re.IGNORECASE
+)
+
+# Free-text ad search: words longer than 4 chars, minus common query words
+_SEARCH_WORD_RE = re.compile(r"[A-Za-z0-9+]{5,}")
+_SEARCH_STOPWORDS = frozenset({
+    "what", "how", "did", "does", "with", "about", "these", "those",
+    "that", "this", "from", "have", "show", "tell", "look", "give",
+    "their", "they", "them", "then", "than", "when", "where", "which",
+})
+
+# Reply for `help` mentions and /pmhelp — static, so built once at import
+_HELP_TEXT = """*JARVIS - Paid Media Intelligence* :robot_face:
+
+At your service. I analyze paid media performance and optimize budget allocation, integrated with the Schumacher Dashboard.
+
+*How to engage me:*
+- Mention me with a question: `@Jarvis How should I reallocate the remaining $50k?`
+- Upload files directly - I can process them automatically!
+- Add context: `@Jarvis context: Focus on lead generation this month`
+
+*File Processing - I can analyze:* :page_facing_up:
+- *CSV files* - Performance reports, exports from ad platforms
+- *Excel files* (.xlsx, .xls) - Multi-sheet workbooks with data
+- *PDF documents* - Reports, presentations, strategy briefs
+- *Word documents* (.docx) - Briefs, notes, strategy docs
+- *PowerPoint slides* (.pptx) - Presentations and slide decks
+- *Images* (.png, .jpg, .gif) - Screenshots, charts, visuals
+- *Text/Markdown* (.txt, .md) - Notes and documentation
+- *JSON files* - Data exports, API responses
+
+Just upload any of these files and I'll automatically extract and analyze the content. Then mention me with your question!
+
+*My capabilities:*
+- Real-time Meta Ads performance analysis with custom date ranges
+- File upload processing and analysis
+- Strategic budget reallocation with reasoning
+- Downloadable CSV reports
+- Contextual memory throughout our conversation
+
+*Date Ranges I support:* :calendar:
+- "last 7 days", "last 14 days", "last 30 days", "last 60 days", "last 90 days"
+- "this month" or "MTD" (month to date)
+- "last month" (previous calendar month)
+- "YTD" (year to date)
+- Specific months like "January", "February 2026"
+
+*Example queries:*
+- "Analyze current campaign performance and suggest optimizations"
+- "How did we perform last 7 days?"
+- "Show me January performance data"
+- "Compare MTD vs last month"
+- "How should I split the remaining $25k budget?"
+- "Which campaigns should I pause?"
+- _(upload a file)_ "Analyze this report and identify optimization opportunities"
+"""
+
+
+# Slack's limit on the text of a single section block
+_SLACK_SECTION_MAX_CHARS = 3000
+
+
+def _default_file_message(filename: str, result: Dict[str, Any]) -> str:
+    return (
+        f":white_check_mark: Processed `{filename}`. "
+        f"Mention me with a question to get started!"
+    )
+
+
+# Confirmation message builders for processed uploads, keyed by result type
+_FILE_TYPE_MESSAGES: Dict[str, Callable[[str, Dict[str, Any]], str]] = {
+    "performance_data": lambda filename, result: (
+        f":white_check_mark: Processed `{filename}` - "
+        f"found {result.get('row_count', 0)} rows of performance data. "
+        f"Mention me with a question to analyze it!"
+    ),
+    "document": lambda filename, result: (
+        f":white_check_mark: Processed `{filename}` - "
+        f"I'll use this as context for analysis. "
+        f"Mention me with a question!"
+    ),
+}
+
+
+class _StatusUpdater:
+    """
+    Coalesces loading-bar updates for a single Slack message.
+
+    Only the most recent state is sent once the debounce window passes, and
+    at most one chat.update is in flight at a time, so updates can't land
+    out of order.
+    """
+
+    def __init__(self, send: Callable[[List[tuple]], Awaitable[None]]):
+        self._send = send
+        self._pending: Optional[List[tuple]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sending = False
+
+    def schedule(self, steps: List[tuple]) -> None:
+        """Queue a new state, replacing any state not yet sent."""
+        self._pending = steps
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._pending is not None:
+            await asyncio.sleep(_STATUS_DEBOUNCE_SECONDS)
+            steps, self._pending = self._pending, None
+            if steps is None:
+                break
+            self._sending = True
+            try:
+                await self._send(steps)
+            finally:
+                self._sending = False
+
+    async def settle(self) -> None:
+        """Drop any queued state and wait for an update already in flight."""
+        self._pending = None
+        task = self._task
+        if task is None or task.done():
+            return
+        if self._sending:
+            await task
+        else:
+            task.cancel()
+
+
+class _ThreadContext:
+    """Per-thread state: uploads, user-provided context and message history."""
+
+    __slots__ = ("uploaded_files", "user_context", "last_analysis", "history", "last_active")
+
+    def __init__(self, max_history_messages: int, now: float):
+        self.uploaded_files: deque = deque(maxlen=_MAX_THREAD_FILES)
+        self.user_context: deque = deque(maxlen=_MAX_THREAD_USER_CONTEXT)
+        self.last_analysis: Optional[str] = None
+        # Clean message history for this thread — stores dicts of
+        # {"role": "user"|"assistant", "content": str} with the raw
+        # user question and Jarvis's response (not the full data dump).
+        # Bounded so old turns are evicted as new ones are appended.
+        self.history: deque = deque(maxlen=max_history_messages)
+        self.last_active = now
+
 
 class SlackBot:
     """
@@ -54,8 +284,14 @@ class SlackBot:
             slack_app_token: Slack App-level token for Socket Mode.
             anthropic_api_key: Anthropic API key for Claude.
         """
+        # One keep-alive session for every Slack Web API call. Without it
+        # slack_sdk opens (and TLS-handshakes) a new session per request;
+        # Bolt's per-event clients inherit this session from the app client.
+        self._slack_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75),
+        )
         self.app = AsyncApp(
-            token=slack_bot_token,
+            client=AsyncWebClient(token=slack_bot_token, session=self._slack_session),
             signing_secret=slack_signing_secret,
         )
         self.app_token = slack_app_token
@@ -63,18 +299,42 @@ class SlackBot:
         # Initialize services - shared with dashboard
         self.meta_service = MetaAdsService()
 
+        # Settings are resolved once here; handlers read self._settings
+        self._settings = get_settings()
+
         # Initialize Live API service for direct Meta Graph API calls
-        settings = get_settings()
-        self.live_api = LiveAPIService(meta_access_token=settings.meta_access_token)
+        self.live_api = LiveAPIService(meta_access_token=self._settings.meta_access_token, pooled=True)
 
         # Initialize AI analyst
         self.analyst = AnthropicAnalyst(api_key=anthropic_api_key)
 
         # Initialize file processor
-        self.file_processor = FileProcessor()
+        # Extraction stops well past the prompt's document budget: the raw
+        # text is whitespace-compacted before it's truncated for the prompt.
+        # File summaries never reach the prompt, so don't compute them.
+        self.file_processor = FileProcessor(
+            max_text_chars=_DOCUMENT_CONTEXT_CHARS * 4,
+            include_summary=False,
+        )
+
+        # Pooled HTTP client for Slack file downloads, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
+
+        # Thread context storage (channel_id:thread_ts -> context), in LRU order
+        self._thread_contexts: "OrderedDict[str, _ThreadContext]" = OrderedDict()
+
+        # Analyses in progress: (thread key, query hash) -> future of the answer
+        self._inflight_analyses: Dict[Tuple[str, str], asyncio.Future] = {}
+
+        # Caps concurrent Claude calls across all threads
+        self._analysis_slots = asyncio.Semaphore(_MAX_CONCURRENT_ANALYSES)
+
+        # Dashboard fallback data: (fetched at, data), refreshed under the lock
+        self._dashboard_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._dashboard_lock = asyncio.Lock()
 
-        # Thread context storage (channel_id:thread_ts -> context)
-        self._thread_contexts: Dict[str, Dict[str, Any]] = {}
+        # Fire-and-forget work (e.g. CSV uploads) kept alive until it completes
+        self._background_tasks: Set[asyncio.Task] = set()
 
         # Register handlers
         self._register_handlers()
@@ -83,54 +343,144 @@ class SlackBot:
 
     def _register_handlers(self) -> None:
         """Register all Slack event handlers."""
+        self.app.event("app_mention")(self._on_app_mention)
+        self.app.event("message")(self._on_message)
+        self.app.event("file_shared")(self._on_file_shared)
+        self.app.command("/analyze")(self._on_analyze_command)
+        self.app.command("/pmhelp")(self._on_help_slash_command)
+        self.app.command("/adreview")(self._on_adreview_command)
 
-        @self.app.event("app_mention")
-        async def handle_app_mention(ack, event: dict, client: AsyncWebClient) -> None:
-            """Handle when the bot is mentioned in a channel."""
-            await ack()
-            channel = event["channel"]
-            user = event["user"]
-            text = event["text"]
-            ts = event["ts"]
-            thread_ts = event.get("thread_ts")
+        logger.info("slack_handlers_registered")
 
-            logger.info("app_mention_received", channel=channel, user=user)
+    # ── Slack event / command handlers ────────────────────────────────────────
+
+    async def _on_app_mention(self, ack, event: dict, client: AsyncWebClient) -> None:
+        """Handle when the bot is mentioned in a channel."""
+        await ack()
+        channel = event["channel"]
+        user = event["user"]
+        text = event["text"]
+        ts = event["ts"]
+        thread_ts = event.get("thread_ts")
+        reply_ts = thread_ts or ts
+
+        logger.info("app_mention_received", channel=channel, user=user)
+
+        # Remove the bot mention from the text
+        clean_text = _MENTION_RE.sub("", text).strip()
+
+        # A bare ping gets the help text rather than a full analysis run
+        if not clean_text:
+            await self.handle_help_command(client, channel, reply_ts)
+            return
+
+        # Check for special commands
+        if clean_text.lower() == "help":
+            await self.handle_help_command(client, channel, reply_ts)
+            return
+
+        # Check for context addition
+        context_match = _CONTEXT_RE.match(clean_text)
+        if context_match:
+            context = context_match.group(1).strip()
+            self.add_context_to_thread(channel, thread_ts, context)
+            await client.chat_postMessage(
+                channel=channel,
+                thread_ts=reply_ts,
+                text=f":white_check_mark: Got it! I'll consider this context: _{context}_",
+            )
+            return
+
+        # Check for clear context command
+        if clean_text.lower() in _CLEAR_COMMANDS:
+            self._evict_thread_context(self.get_thread_key(channel, thread_ts))
+            # analyst._conversation_context is now vestigial but clear it too
+            self.analyst.clear_context()
+            await client.chat_postMessage(
+                channel=channel,
+                thread_ts=reply_ts,
+                text=":broom: Context cleared! Starting fresh.",
+            )
+            return
 
-            # Remove the bot mention from the text
-            clean_text = re.sub(r"<@[A-Z0-9]+>", "", text).strip()
+        # Regular analysis request
+        await self.analyze_and_respond(
+            client=client,
+            channel=channel,
+            thread_ts=thread_ts,
+            user_query=clean_text,
+            mention_ts=ts,
+        )
 
-            # Check for special commands
-            if clean_text.lower() == "help":
-                await self.handle_help_command(client, channel, thread_ts or ts)
-                return
+    async def _on_message(self, ack, event: dict, client: AsyncWebClient) -> None:
+        """Handle direct messages and messages with file uploads."""
+        await ack()
+        # Ignore bot messages
+        if event.get("bot_id") or event.get("subtype") == "bot_message":
+            return
+
+        channel = event["channel"]
+        channel_type = event.get("channel_type", "")
+        thread_ts = event.get("thread_ts")
+        ts = event["ts"]
+        reply_ts = thread_ts or ts
+
+        # Handle file uploads
+        files_processed = []
+        if "files" in event and event["files"]:
+            logger.info("files_uploaded", count=len(event["files"]), channel=channel)
+
+            # Download and parse every file concurrently, then store the
+            # results in upload order so the thread context stays stable
+            processable = [
+                f for f in event["files"]
+                if self.file_processor.can_process(f.get("name", ""))
+            ]
+            results = await asyncio.gather(
+                *(self._download_and_process(client, f) for f in processable)
+            )
 
-            # Check for context addition
-            context_match = re.match(r"context:\s*(.+)", clean_text, re.IGNORECASE)
-            if context_match:
-                context = context_match.group(1).strip()
-                self.add_context_to_thread(channel, thread_ts, context)
-                await client.chat_postMessage(
-                    channel=channel,
-                    thread_ts=thread_ts or ts,
-                    text=f":white_check_mark: Got it! I'll consider this context: _{context}_",
-                )
-                return
+            confirmations: List[str] = []
+            for file_info, result in zip(processable, results):
+                self._store_uploaded_file(channel, thread_ts, result)
+                files_processed.append(result)
 
-            # Check for clear context command
-            if clean_text.lower() in ["clear context", "reset", "start over"]:
-                key = self.get_thread_key(channel, thread_ts)
-                if key in self._thread_contexts:
-                    del self._thread_contexts[key]
-                # analyst._conversation_context is now vestigial but clear it too
-                self.analyst.clear_context()
+                if result.get("type") == "error":
+                    msg = f":warning: Could not process `{file_info.get('name')}`: {result.get('error')}"
+                else:
+                    build_msg = _FILE_TYPE_MESSAGES.get(
+                        result.get("type", "file"), _default_file_message
+                    )
+                    msg = build_msg(result.get("filename", "file"), result)
+                confirmations.append(msg)
+
+            # One confirmation message for the whole upload, a section per file
+            if confirmations:
                 await client.chat_postMessage(
                     channel=channel,
-                    thread_ts=thread_ts or ts,
-                    text=":broom: Context cleared! Starting fresh.",
+                    thread_ts=reply_ts,
+                    text="\n".join(confirmations),
+                    blocks=[
+                        {
+                            "type": "section",
+                            "text": {"type": "mrkdwn", "text": msg[:_SLACK_SECTION_MAX_CHARS]},
+                        }
+                        for msg in confirmations
+                    ],
                 )
-                return
 
-            # Regular analysis request
+        # Check if there's a text message along with the file upload that contains a question
+        text = event.get("text", "").strip()
+        if not text:
+            return
+        # Remove any user/bot mentions from the text
+        clean_text = _MENTION_RE.sub("", text).strip()
+        if not clean_text:
+            return
+
+        # If files were uploaded and there's also a question, analyze immediately
+        if files_processed and len(clean_text) > 5:
+            logger.info("file_upload_with_question", question=clean_text[:50])
             await self.analyze_and_respond(
                 client=client,
                 channel=channel,
@@ -138,194 +488,109 @@ class SlackBot:
                 user_query=clean_text,
                 mention_ts=ts,
             )
+            return
 
-        @self.app.event("message")
-        async def handle_message(ack, event: dict, client: AsyncWebClient) -> None:
-            """Handle direct messages and messages with file uploads."""
-            await ack()
-            # Ignore bot messages
-            if event.get("bot_id") or event.get("subtype") == "bot_message":
-                return
-
-            channel = event["channel"]
-            channel_type = event.get("channel_type", "")
-            thread_ts = event.get("thread_ts")
-            ts = event["ts"]
-
-            # Handle file uploads
-            files_processed = []
-            if "files" in event and event["files"]:
-                logger.info("files_uploaded", count=len(event["files"]), channel=channel)
-
-                for file_info in event["files"]:
-                    if self.file_processor.can_process(file_info.get("name", "")):
-                        result = await self.process_file_upload(
-                            client=client,
-                            channel=channel,
-                            thread_ts=thread_ts,
-                            file_info=file_info,
-                        )
-                        files_processed.append(result)
-
-                        if result.get("type") == "error":
-                            await client.chat_postMessage(
-                                channel=channel,
-                                thread_ts=thread_ts or ts,
-                                text=f":warning: Could not process `{file_info.get('name')}`: {result.get('error')}",
-                            )
-                        else:
-                            file_type = result.get("type", "file")
-                            filename = result.get("filename", "file")
-
-                            if file_type == "performance_data":
-                                msg = (
-                                    f":white_check_mark: Processed `{filename}` - "
-                                    f"found {result.get('row_count', 0)} rows of performance data. "
-                                    f"Mention me with a question to analyze it!"
-                                )
-                            elif file_type == "document":
-                                msg = (
-                                    f":white_check_mark: Processed `{filename}` - "
-                                    f"I'll use this as context for analysis. "
-                                    f"Mention me with a question!"
-                                )
-                            else:
-                                msg = (
-                                    f":white_check_mark: Processed `{filename}`. "
-                                    f"Mention me with a question to get started!"
-                                )
-
-                            await client.chat_postMessage(
-                                channel=channel,
-                                thread_ts=thread_ts or ts,
-                                text=msg,
-                            )
-
-            # Check if there's a text message along with the file upload that contains a question
-            text = event.get("text", "").strip()
-            # Remove any user/bot mentions from the text
-            clean_text = re.sub(r"<@[A-Z0-9]+>", "", text).strip()
-
-            # If files were uploaded and there's also a question, analyze immediately
-            if files_processed and clean_text and len(clean_text) > 5:
-                logger.info("file_upload_with_question", question=clean_text[:50])
-                await self.analyze_and_respond(
-                    client=client,
-                    channel=channel,
-                    thread_ts=thread_ts,
-                    user_query=clean_text,
-                    mention_ts=ts,
-                )
-                return
-
-            # Handle direct messages (not in channels)
-            if channel_type == "im" and not files_processed:
-                text = event.get("text", "").strip()
-                if text:
-                    # In DMs, treat every message as a query
-                    await self.analyze_and_respond(
-                        client=client,
-                        channel=channel,
-                        thread_ts=thread_ts,
-                        user_query=text,
-                        mention_ts=ts,
-                    )
-
-        @self.app.event("file_shared")
-        async def handle_file_shared(ack, event: dict, client: AsyncWebClient) -> None:
-            """Handle when a file is shared (backup handler)."""
-            await ack()
-            logger.debug("file_shared_event", file_id=event.get("file_id"))
+        # Handle direct messages (not in channels)
+        if channel_type == "im" and not files_processed:
+            # In DMs, treat every message as a query
+            await self.analyze_and_respond(
+                client=client,
+                channel=channel,
+                thread_ts=thread_ts,
+                user_query=text,
+                mention_ts=ts,
+            )
 
-        @self.app.command("/analyze")
-        async def handle_analyze_command(ack, body: dict, client: AsyncWebClient) -> None:
-            """Handle the /analyze slash command."""
-            await ack()
+    async def _on_file_shared(self, ack, event: dict, client: AsyncWebClient) -> None:
+        """Handle when a file is shared (backup handler)."""
+        await ack()
+        logger.debug("file_shared_event", file_id=event.get("file_id"))
 
-            channel = body["channel_id"]
-            user = body["user_id"]
-            text = body.get("text", "").strip()
+    async def _on_analyze_command(self, ack, body: dict, client: AsyncWebClient) -> None:
+        """Handle the /analyze slash command."""
+        await ack()
 
-            logger.info("analyze_command", channel=channel, user=user)
+        channel = body["channel_id"]
+        user = body["user_id"]
+        text = body.get("text", "").strip()
 
-            if not text:
-                await client.chat_postEphemeral(
-                    channel=channel,
-                    user=user,
-                    text="Please provide a query. Example: `/analyze How should I reallocate the remaining $50k?`",
-                )
-                return
+        logger.info("analyze_command", channel=channel, user=user)
 
-            # Post a message indicating analysis is starting
-            msg = await client.chat_postMessage(
+        if not text:
+            await client.chat_postEphemeral(
                 channel=channel,
-                text=f"<@{user}> requested analysis: _{text}_",
+                user=user,
+                text="Please provide a query. Example: `/analyze How should I reallocate the remaining $50k?`",
             )
+            return
 
-            await self.analyze_and_respond(
-                client=client,
-                channel=channel,
-                thread_ts=None,
-                user_query=text,
-                mention_ts=msg["ts"],
-            )
+        # Post a message indicating analysis is starting
+        msg = await client.chat_postMessage(
+            channel=channel,
+            text=f"<@{user}> requested analysis: _{text}_",
+        )
 
-        @self.app.command("/pmhelp")
-        async def handle_help_slash_command(ack, body: dict, client: AsyncWebClient) -> None:
-            """Handle the /pmhelp slash command."""
-            await ack()
+        await self.analyze_and_respond(
+            client=client,
+            channel=channel,
+            thread_ts=None,
+            user_query=text,
+            mention_ts=msg["ts"],
+        )
 
-            channel = body["channel_id"]
+    async def _on_help_slash_command(self, ack, body: dict, client: AsyncWebClient) -> None:
+        """Handle the /pmhelp slash command."""
+        await ack()
 
-            await self.handle_help_command(
-                client=client,
-                channel=channel,
-                thread_ts=None,
-            )
+        channel = body["channel_id"]
 
-        @self.app.command("/adreview")
-        async def handle_adreview_command(ack, body: dict, client: AsyncWebClient) -> None:
-            """
-            Handle the /adreview slash command.
-            Fetches all active ads with performance data and asks Jarvis
-            to recommend which to pause to get back under the 250 limit.
-            """
-            await ack()
+        await self.handle_help_command(
+            client=client,
+            channel=channel,
+            thread_ts=None,
+        )
 
-            channel = body["channel_id"]
-            user = body["user_id"]
-            extra_context = body.get("text", "").strip()
+    async def _on_adreview_command(self, ack, body: dict, client: AsyncWebClient) -> None:
+        """
+        Handle the /adreview slash command.
+        Fetches all active ads with performance data and asks Jarvis
+        to recommend which to pause to get back under the 250 limit.
+        """
+        await ack()
 
-            msg = await client.chat_postMessage(
-                channel=channel,
-                text=f"<@{user}> requested an ad review. :hourglass_flowing_sand: Pulling active ad performance data...",
-            )
+        channel = body["channel_id"]
+        user = body["user_id"]
+        extra_context = body.get("text", "").strip()
 
-            query = (
-                "Review all active ads and recommend which ones to pause to get the account "
-                "back under the 250 ad limit. Prioritize pausing based on: zero leads + high spend, "
-                "high CPL vs campaign average, and duplicate creatives. Protect ads still in the "
-                "learning phase (under 14 days). Format your recommendations as a numbered pause list."
-            )
-            if extra_context:
-                query += f"\n\nAdditional context from user: {extra_context}"
+        msg = await client.chat_postMessage(
+            channel=channel,
+            text=f"<@{user}> requested an ad review. :hourglass_flowing_sand: Pulling active ad performance data...",
+        )
 
-            await self.analyze_and_respond(
-                client=client,
-                channel=channel,
-                thread_ts=msg["ts"],
-                user_query=query,
-                mention_ts=msg["ts"],
-                force_ad_performance=True,
-            )
+        query = (
+            "Review all active ads and recommend which ones to pause to get the account "
+            "back under the 250 ad limit. Prioritize pausing based on: zero leads + high spend, "
+            "high CPL vs campaign average, and duplicate creatives. Protect ads still in the "
+            "learning phase (under 14 days). Format your recommendations as a numbered pause list."
+        )
+        if extra_context:
+            query += f"\n\nAdditional context from user: {extra_context}"
 
-        logger.info("slack_handlers_registered")
+        await self.analyze_and_respond(
+            client=client,
+            channel=channel,
+            thread_ts=msg["ts"],
+            user_query=query,
+            mention_ts=msg["ts"],
+            force_ad_performance=True,
+        )
 
     # Maximum number of prior exchanges to carry in context per thread.
     # Each exchange = 1 user turn + 1 assistant turn.  Keeping this bounded
     # prevents token bloat while still giving Jarvis enough back-history to
     # follow a conversation without needing re-explanation.
     _MAX_HISTORY_TURNS = 10
+    _MAX_HISTORY_MESSAGES = _MAX_HISTORY_TURNS * 2
 
     def get_thread_key(self, channel: str, thread_ts: Optional[str]) -> str:
         """
@@ -339,38 +604,61 @@ class SlackBot:
             return f"{channel}:{thread_ts}"
         return f"{channel}:main"
 
-    def get_thread_context(self, channel: str, thread_ts: Optional[str]) -> Dict[str, Any]:
-        """Get or create context for a thread."""
+    def get_thread_context(
+        self,
+        channel: str,
+        thread_ts: Optional[str],
+    ) -> Tuple[_ThreadContext, str]:
+        """Get or create context for a thread, returning it with its storage key."""
         key = self.get_thread_key(channel, thread_ts)
-        if key not in self._thread_contexts:
-            self._thread_contexts[key] = {
-                "uploaded_files": [],
-                "user_context": [],
-                "last_analysis": None,
-                # Clean message history for this thread — stores dicts of
-                # {"role": "user"|"assistant", "content": str} with the raw
-                # user question and Jarvis's response (not the full data dump).
-                "history": [],
-            }
-        logger.debug("get_thread_context", key=key,
-                     history_turns=len(self._thread_contexts[key].get("history", [])) // 2)
-        return self._thread_contexts[key]
+        now = time.monotonic()
+        ctx = self._thread_contexts.get(key)
+        if ctx is not None and now - ctx.last_active > _THREAD_CONTEXT_TTL_SECONDS:
+            self._evict_thread_context(key)
+            ctx = None
+        if ctx is None:
+            ctx = self._thread_contexts[key] = _ThreadContext(self._MAX_HISTORY_MESSAGES, now)
+            self._prune_thread_contexts(now)
+        else:
+            ctx.last_active = now
+            self._thread_contexts.move_to_end(key)
+        logger.debug("get_thread_context", key=key, history_turns=len(ctx.history) // 2)
+        return ctx, key
+
+    def _prune_thread_contexts(self, now: float) -> None:
+        """Evict expired threads and the least recently used ones past the cap."""
+        contexts = self._thread_contexts
+        while contexts:
+            key, oldest = next(iter(contexts.items()))
+            if (
+                len(contexts) <= _THREAD_CONTEXT_MAX_ENTRIES
+                and now - oldest.last_active <= _THREAD_CONTEXT_TTL_SECONDS
+            ):
+                break
+            self._evict_thread_context(key)
+
+    def _evict_thread_context(self, key: str) -> None:
+        """Forget a thread's context."""
+        self._thread_contexts.pop(key, None)
+        logger.debug("thread_context_evicted", key=key)
+
+    def _get_history(self, ctx: _ThreadContext) -> Sequence[Dict[str, str]]:
+        """
+        Return the bounded message history for this thread.
 
-    def _get_history(self, ctx: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Return the bounded message history for this thread."""
-        history = ctx.get("history", [])
-        # Each turn is a user+assistant pair (2 items); keep last N turns
-        max_messages = self._MAX_HISTORY_TURNS * 2
-        return history[-max_messages:] if len(history) > max_messages else history
+        The deque already holds only the last N turns, so it is returned
+        as-is; the analyst copies it when building the request messages.
+        """
+        return ctx.history
 
     def _append_history(
         self,
-        ctx: Dict[str, Any],
+        ctx: _ThreadContext,
         user_query: str,
         assistant_response: str,
     ) -> None:
         """Append a completed exchange to thread history."""
-        history = ctx.setdefault("history", [])
+        history = ctx.history
         history.append({"role": "user", "content": user_query})
         history.append({"role": "assistant", "content": assistant_response})
 
@@ -381,30 +669,64 @@ class SlackBot:
         context: str,
     ) -> None:
         """Add user-provided context to a thread."""
-        ctx = self.get_thread_context(channel, thread_ts)
-        ctx["user_context"].append(context)
+        ctx, _ = self.get_thread_context(channel, thread_ts)
+        ctx.user_context.append(context)
         # Also inject it as a history exchange so Claude sees it as prior chat
         self._append_history(ctx, f"context: {context}", "Understood. I'll keep that in mind.")
         logger.info("context_added_to_thread", channel=channel, thread_ts=thread_ts)
 
-    async def process_file_upload(
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the shared download client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Release pooled connections. Called on application shutdown."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if not self._slack_session.closed:
+            await self._slack_session.close()
+        await self.live_api.aclose()
+
+    async def _download_and_process(
         self,
         client: AsyncWebClient,
-        channel: str,
-        thread_ts: Optional[str],
         file_info: Dict[str, Any],
     ) -> Dict[str, Any]:
-        """Process an uploaded file and store in thread context."""
-        filename = file_info.get("name", "unknown")
+        """
+        Download, parse and pre-render an uploaded file without touching thread state.
 
-        if not self.file_processor.can_process(filename):
-            logger.warning("unsupported_file_type", filename=filename)
+        Failures of any kind come back as an error result, so one bad file
+        never aborts the rest of a multi-file upload. Callers must already
+        have checked the file type with can_process.
+        """
+        filename = file_info.get("name", "unknown")
+        try:
+            processed = await self._download_and_parse(client, file_info, filename)
+            # Render the prompt block now (off the event loop) so analysis
+            # turns only read the cache
+            await asyncio.to_thread(self._format_file_context, processed)
+        except Exception as e:
+            logger.error("file_processing_failed", filename=filename, error=str(e))
             return {
                 "type": "error",
                 "filename": filename,
-                "error": "Unsupported file type",
+                "error": str(e),
             }
+        return processed
 
+    async def _download_and_parse(
+        self,
+        client: AsyncWebClient,
+        file_info: Dict[str, Any],
+        filename: str,
+    ) -> Dict[str, Any]:
+        """Stream an uploaded file from Slack and run it through the file processor."""
         # Download file content
         file_url = file_info.get("url_private_download") or file_info.get("url_private")
 
@@ -415,44 +737,187 @@ class SlackBot:
                 "error": "Could not get file URL",
             }
 
-        # Use httpx to download with proper auth
-        async with httpx.AsyncClient() as http_client:
-            file_response = await http_client.get(
+        # Stream the download with proper auth so memory stays bounded by the
+        # chunk size rather than holding the whole response body
+        with tempfile.SpooledTemporaryFile(max_size=_DOWNLOAD_SPOOL_BYTES) as file_content:
+            async with self._get_http().stream(
+                "GET",
                 file_url,
                 headers={"Authorization": f"Bearer {client.token}"},
-            )
-            file_content = file_response.content
+            ) as file_response:
+                if file_response.is_error:
+                    logger.warning(
+                        "file_download_failed",
+                        filename=filename,
+                        status_code=file_response.status_code,
+                    )
+                    return {
+                        "type": "error",
+                        "filename": filename,
+                        "error": f"Download failed (HTTP {file_response.status_code})",
+                    }
+                async for chunk in file_response.aiter_bytes(_DOWNLOAD_CHUNK_BYTES):
+                    file_content.write(chunk)
+
+            # Process the file
+            return await self.file_processor.process_file(file_content, filename)
 
-        # Process the file
-        processed = await self.file_processor.process_file(file_content, filename)
+    def _store_uploaded_file(
+        self,
+        channel: str,
+        thread_ts: Optional[str],
+        processed: Dict[str, Any],
+    ) -> None:
+        """Add a processed file to its thread's context."""
+        # Download failures and unparseable files carry nothing worth
+        # sending to the analyst
+        if processed.get("type") == "error":
+            return
 
-        # Store in thread context
-        ctx = self.get_thread_context(channel, thread_ts)
-        ctx["uploaded_files"].append(processed)
+        ctx, key = self.get_thread_context(channel, thread_ts)
+        ctx.uploaded_files.append(processed)
 
         logger.info(
             "file_processed_and_stored",
-            filename=filename,
+            filename=processed.get("filename"),
             channel=channel,
             thread_ts=thread_ts,
-            context_key=self.get_thread_key(channel, thread_ts),
-            total_files=len(ctx["uploaded_files"]),
+            context_key=key,
+            total_files=len(ctx.uploaded_files),
             file_type=processed.get("type"),
         )
 
-        return processed
+    def _format_file_context(self, file_data: Dict[str, Any]) -> str:
+        """
+        Render an uploaded file as a prompt context block.
+
+        The rendered block is cached on the file record, so follow-up
+        questions in the same thread don't re-serialize the file's data.
+        """
+        cached = file_data.get("_context_str")
+        if cached is not None:
+            return cached
+
+        parts: List[str] = []
+        append = parts.append
+        get = file_data.get
+        file_type = get("type", "unknown")
+        filename = get("filename", "unknown")
+
+        if file_type in ("performance_data", "tabular"):
+            columns = get("columns", [])
+            row_count = get("row_count", 0)
+            data = get("data", [])
+            append(
+                f"=== UPLOADED FILE: '{filename}' ===\n"
+                f"Type: {file_type}\n"
+                f"Columns: {', '.join(columns)}\n"
+                f"Total rows: {row_count}\n"
+            )
+            if data:
+                # Large tables arrive as a head + tail sample; row_count is the real size
+                if row_count <= 50:
+                    append(f"Complete data:\n{to_json_text(data)}")
+                else:
+                    append(f"First 20 rows:\n{to_json_text(data[:20])}")
+                    append(f"Last 10 rows:\n{to_json_text(data[-10:])}")
+
+        elif file_type == "spreadsheet":
+            sheets = get("sheets", {})
+            sheet_names = get("sheet_names", [])
+            row_counts = get("sheet_row_counts", {})
+            append(
+                f"=== UPLOADED SPREADSHEET: '{filename}' ===\n"
+                f"Sheets: {', '.join(sheet_names)}\n"
+            )
+            for sheet_name, sheet_data in sheets.items():
+                if sheet_data:
+                    append(
+                        f"\n--- Sheet '{sheet_name}' ({row_counts.get(sheet_name, len(sheet_data))} rows) ---\n"
+                        f"Columns: {', '.join(map(str, sheet_data[0]))}\n"
+                        f"{truncated_json(sheet_data[:20], _SHEET_CONTEXT_BYTES)}"
+                    )
+
+        elif file_type == "document":
+            text_content = get("text_content", "")
+            append(
+                f"=== UPLOADED DOCUMENT: '{filename}' ===\n"
+                f"Format: {get('format', 'unknown')}\n"
+                f"Content:\n{truncate_text(text_content, _DOCUMENT_CONTEXT_CHARS)}"
+            )
+
+        elif file_type == "json":
+            json_data = get("data", {})
+            append(
+                f"=== UPLOADED JSON: '{filename}' ===\n"
+                f"Data:\n{truncated_json(json_data, _JSON_CONTEXT_BYTES)}"
+            )
+
+        elif file_type == "image":
+            # The image bytes aren't sent to Claude, so just note the upload
+            append(f"=== UPLOADED IMAGE: '{filename}' (content not attached) ===")
+
+        else:
+            logger.warning("unknown_file_type", file_type=file_type, filename=filename)
+            append(
+                f"=== UPLOADED FILE: '{filename}' (type: {file_type}) ===\n"
+                f"Data: {truncated_json(file_data, _UNKNOWN_FILE_CONTEXT_BYTES)}"
+            )
+
+        rendered = "\n\n".join(parts)
+        file_data["_context_str"] = rendered
+        return rendered
+
+    async def _render_file_contexts(self, files: List[Dict[str, Any]]) -> List[str]:
+        """Render context blocks for uploaded files, serializing uncached ones in worker threads."""
+        rendered = [file_data.get("_context_str") for file_data in files]
+        missing = [i for i, text in enumerate(rendered) if text is None]
+        if missing:
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._format_file_context, files[i]) for i in missing
+            ))
+            for i, text in zip(missing, results):
+                rendered[i] = text
+        return rendered
+
+    async def _get_performance_data_from_dashboard(self) -> Dict[str, Any]:
+        """
+        Return dashboard performance data, reusing a fetch from the last few seconds.
 
-    def _get_performance_data_from_dashboard(self) -> Dict[str, Any]:
+        Concurrent callers wait on one refresh rather than each hitting the
+        Meta Ads service.
+        """
+        async with self._dashboard_lock:
+            cached = self._dashboard_cache
+            if cached is not None and time.monotonic() - cached[0] < _DASHBOARD_CACHE_TTL_SECONDS:
+                return cached[1]
+
+            performance_data = await self._fetch_performance_data_from_dashboard()
+            # Don't pin a total failure for the whole TTL
+            if performance_data:
+                self._dashboard_cache = (time.monotonic(), performance_data)
+            return performance_data
+
+    async def _fetch_performance_data_from_dashboard(self) -> Dict[str, Any]:
         """
         Fetch performance data from the integrated Meta Ads service.
 
-        This uses the same data source as the Schumacher Dashboard.
+        This uses the same data source as the Schumacher Dashboard. The three
+        service calls are blocking, so they run concurrently in worker threads.
         """
         performance_data = {}
 
+        metrics, campaigns, trends = await asyncio.gather(
+            asyncio.to_thread(self.meta_service.get_metrics_overview),
+            asyncio.to_thread(self.meta_service.get_campaigns),
+            asyncio.to_thread(self.meta_service.get_trend_data, days=7),
+            return_exceptions=True,
+        )
+
         try:
-            # Get metrics overview (same as dashboard home page)
-            metrics = self.meta_service.get_metrics_overview()
+            # Metrics overview (same as dashboard home page)
+            if isinstance(metrics, Exception):
+                raise metrics
             performance_data["summary"] = {
                 "total_spend": metrics.spend,
                 "total_budget": 0,  # Budget tracking not yet implemented
@@ -478,8 +943,9 @@ class SlackBot:
             logger.warning("metrics_overview_error", error=str(e))
 
         try:
-            # Get campaign performance (same as dashboard campaigns page)
-            campaigns = self.meta_service.get_campaigns()
+            # Campaign performance (same as dashboard campaigns page)
+            if isinstance(campaigns, Exception):
+                raise campaigns
             performance_data["campaigns"] = [
                 {
                     "id": c.id,
@@ -501,8 +967,9 @@ class SlackBot:
             logger.warning("campaigns_error", error=str(e))
 
         try:
-            # Get trend data for context
-            trends = self.meta_service.get_trend_data(days=7)
+            # Trend data for context
+            if isinstance(trends, Exception):
+                raise trends
             if trends:
                 total_spend = sum(t.spend for t in trends)
                 total_leads = sum(t.leads for t in trends)
@@ -543,26 +1010,32 @@ class SlackBot:
         "what i paused", "list of what", "list of paused",
     ]
 
-    def _is_paused_ads_query(self, query: str) -> bool:
+    # The _is_*_query detectors take the already-lowercased query so it is
+    # normalized once per analysis rather than once per detector.
+
+    # Each keyword list compiled into a single alternation, so detection is
+    # one scan over the query rather than one substring search per keyword
+    _PAUSED_ADS_RE = re.compile("|".join(map(re.escape, _PAUSED_ADS_KEYWORDS)))
+    _AD_LIMIT_RE = re.compile("|".join(map(re.escape, _AD_LIMIT_KEYWORDS)))
+    _AD_LOOKUP_RE = re.compile("|".join(map(re.escape, _AD_LOOKUP_KEYWORDS)))
+
+    def _is_paused_ads_query(self, q: str) -> bool:
         """Return True if the user is asking to see recently paused ads / change history."""
-        q = query.lower()
-        return any(kw in q for kw in self._PAUSED_ADS_KEYWORDS)
+        return self._PAUSED_ADS_RE.search(q) is not None
 
-    def _is_ad_limit_query(self, query: str) -> bool:
+    def _is_ad_limit_query(self, q: str) -> bool:
         """Return True if the query is related to the ad limit / pausing ads."""
-        q = query.lower()
-        return any(kw in q for kw in self._AD_LIMIT_KEYWORDS)
+        return self._AD_LIMIT_RE.search(q) is not None
 
-    def _is_ad_lookup_query(self, query: str) -> bool:
+    def _is_ad_lookup_query(self, q: str) -> bool:
         """
         Return True if the query references specific ads or creative names.
         This triggers ad-level data fetching so Jarvis can look up individual ads.
         """
-        q = query.lower()
         # Pipe-delimited naming convention used in Schumacher ad names
         if q.count("|") >= 2:
             return True
-        return any(kw in q for kw in self._AD_LOOKUP_KEYWORDS)
+        return self._AD_LOOKUP_RE.search(q) is not None
 
     def _extract_search_terms(self, query: str) -> List[str]:
         """
@@ -582,21 +1055,11 @@ class SlackBot:
                 if i == 0:
                     # Strip sentence prefix — keep only the ad-name fragment.
                     # Step 1: split on colon or explicit intro words
-                    cleaned = tok
-                    stripped = re.split(
-                        r"[:]\s*|(?:ads?|these|those|following|creatives?)\s+",
-                        cleaned,
-                        flags=re.IGNORECASE,
-                    )
-                    cleaned = stripped[-1].strip()
+                    cleaned = _AD_NAME_PREFIX_RE.split(tok)[-1].strip()
 
                     # Step 2: if still a long sentence, grab phrase after prepositions/verbs
                     if len(cleaned.split()) > 3:
-                        match = re.search(
-                            r"(?:of|for|on|about|check|pull|get|show|see)\s+(.+)$",
-                            cleaned,
-                            flags=re.IGNORECASE,
-                        )
+                        match = _AD_NAME_PHRASE_RE.search(cleaned)
                         if match:
                             cleaned = match.group(1).strip()
 
@@ -613,20 +1076,26 @@ class SlackBot:
             if len(terms) >= 2:
                 terms.append(" | ".join(terms[:3]))
 
-            return list(dict.fromkeys(terms))  # deduplicate, preserve order
+            return self._dedupe_terms(terms)
 
         # Otherwise use words longer than 4 chars that aren't stopwords
-        stopwords = {"what", "how", "did", "does", "with", "about", "these", "those",
-                     "that", "this", "from", "have", "show", "tell", "look", "give",
-                     "their", "they", "them", "then", "than", "when", "where", "which"}
-        words = re.findall(r"[A-Za-z0-9+]+", query)
-        return [w for w in words if len(w) > 4 and w.lower() not in stopwords]
+        return self._dedupe_terms(
+            w for w in _SEARCH_WORD_RE.findall(query) if w.lower() not in _SEARCH_STOPWORDS
+        )
 
-    # ── Loading bar helpers ───────────────────────────────────────────────────
+    @staticmethod
+    def _dedupe_terms(terms: Iterable[str]) -> List[str]:
+        """Deduplicate search terms case-insensitively, keeping first-seen order."""
+        seen = set()
+        unique = []
+        for term in terms:
+            key = term.lower()
+            if key not in seen:
+                seen.add(key)
+                unique.append(term)
+        return unique
 
-    _BAR_FILL = "█"
-    _BAR_EMPTY = "░"
-    _BAR_WIDTH = 10
+    # ── Loading bar helpers ───────────────────────────────────────────────────
 
     def _render_status(
         self,
@@ -644,9 +1113,9 @@ class SlackBot:
         done_count = sum(1 for _, s in steps if s == "done")
         total = len(steps)
         pct = int((done_count / total) * 100) if total else 0
-        filled = int((done_count / total) * self._BAR_WIDTH) if total else 0
+        filled = int((done_count / total) * _BAR_WIDTH) if total else 0
 
-        bar = self._BAR_FILL * filled + self._BAR_EMPTY * (self._BAR_WIDTH - filled)
+        bar = _STATUS_BARS[filled]
 
         date_str = ""
         if date_range:
@@ -694,6 +1163,28 @@ class SlackBot:
         force_ad_performance: bool = False,
     ) -> None:
         """Perform analysis and respond with results."""
+        # Every log line emitted for this analysis (including background
+        # tasks it spawns) carries the channel and thread
+        with bound_contextvars(channel=channel, thread_ts=thread_ts):
+            await self._run_analysis(
+                client=client,
+                channel=channel,
+                thread_ts=thread_ts,
+                user_query=user_query,
+                mention_ts=mention_ts,
+                force_ad_performance=force_ad_performance,
+            )
+
+    async def _run_analysis(
+        self,
+        client: AsyncWebClient,
+        channel: str,
+        thread_ts: Optional[str],
+        user_query: str,
+        mention_ts: str,
+        force_ad_performance: bool,
+    ) -> None:
+        """Run the fetch → context → Claude → reply pipeline for one query."""
         reply_ts = thread_ts or mention_ts
 
         # Resolve date range up front so the status bar can show it immediately
@@ -705,29 +1196,129 @@ class SlackBot:
         account_id = get_account_id_from_query(user_query)
 
         # Decide which extra fetch stages we'll need
-        needs_paused_ads = self._is_paused_ads_query(user_query)
-        needs_ad_limit = (not needs_paused_ads) and (force_ad_performance or self._is_ad_limit_query(user_query))
-        needs_ad_lookup = (not needs_paused_ads) and (not needs_ad_limit) and self._is_ad_lookup_query(user_query)
+        query_lower = user_query.lower()
+        needs_paused_ads = self._is_paused_ads_query(query_lower)
+        needs_ad_limit = (not needs_paused_ads) and (force_ad_performance or self._is_ad_limit_query(query_lower))
+        needs_ad_lookup = (not needs_paused_ads) and (not needs_ad_limit) and self._is_ad_lookup_query(query_lower)
+
+        # A double-sent mention (same question against the same thread
+        # history) shares the answer already being produced instead of
+        # running the fetches and the Claude call a second time
+        thread_ctx, thread_key = self.get_thread_context(channel, thread_ts)
+        inflight_key = (thread_key, self._analysis_key(
+            account_id, date_range, query_lower, force_ad_performance, thread_ctx.history,
+        ))
+        pending = self._inflight_analyses.get(inflight_key)
+        if pending is not None:
+            logger.info("analysis_coalesced")
+            shared = await asyncio.shield(pending)
+            if shared is not None:
+                ctx, _ = self.get_thread_context(channel, thread_ts)
+                slack_response, budget_table = await self._record_analysis(ctx, user_query, shared)
+                await client.chat_postMessage(channel=channel, thread_ts=reply_ts, text=slack_response)
+                if budget_table:
+                    self._spawn(self._upload_budget_csv(client, channel, reply_ts, budget_table))
+                return
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight_analyses[inflight_key] = inflight
 
+        analysis = None
+        try:
+            analysis = await self._run_fresh_analysis(
+                client,
+                channel,
+                thread_ts,
+                user_query,
+                reply_ts=reply_ts,
+                date_range=date_range,
+                account_id=account_id,
+                needs_paused_ads=needs_paused_ads,
+                needs_ad_limit=needs_ad_limit,
+                needs_ad_lookup=needs_ad_lookup,
+            )
+        finally:
+            if self._inflight_analyses.get(inflight_key) is inflight:
+                del self._inflight_analyses[inflight_key]
+            # Waiters run their own analysis if this one produced nothing
+            inflight.set_result(analysis)
+
+    async def _run_fresh_analysis(
+        self,
+        client: AsyncWebClient,
+        channel: str,
+        thread_ts: Optional[str],
+        user_query: str,
+        *,
+        reply_ts: str,
+        date_range: DateRange,
+        account_id: str,
+        needs_paused_ads: bool,
+        needs_ad_limit: bool,
+        needs_ad_lookup: bool,
+    ) -> Optional[str]:
+        """Fetch data, ask Claude and post the answer; returns it, or None on failure."""
         # Build the step list for the status bar
-        base_steps: List[tuple] = [
-            ("Account & campaign data", "active"),
-        ]
         if needs_paused_ads:
-            base_steps.append(("Paused ads history", "pending"))
-        if needs_ad_limit:
-            base_steps.append(("Active ads inventory", "pending"))
-        if needs_ad_lookup:
-            base_steps.append(("Ad-level creative data", "pending"))
-        base_steps.append(("Thinking…", "pending"))
+            stage2_step = _STEP_PAUSED
+        elif needs_ad_limit:
+            stage2_step = _STEP_INVENTORY
+        elif needs_ad_lookup:
+            stage2_step = _STEP_LOOKUP
+        else:
+            stage2_step = None
+
+        base_steps: List[tuple] = [(_STEP_ACCOUNT, "active")]
+        if stage2_step:
+            base_steps.append((stage2_step, "pending"))
+        base_steps.append((_STEP_THINKING, "pending"))
+
+        # Kick off Stage 1 before posting the loading message so the Slack
+        # round-trip overlaps with the Meta API calls instead of preceding them
+        stage1 = asyncio.gather(
+            self.live_api.get_meta_account_insights(
+                account_id=account_id,
+                date_range=date_range,
+                level="account"
+            ),
+            self.live_api.get_meta_campaigns(
+                account_id=account_id,
+                date_range=date_range
+            ),
+            self.live_api.get_meta_active_ads_count(account_id),
+        )
+
+        # Stage 2 fetches don't depend on Stage 1 results, so start them now too
+        search_terms: List[str] = []
+        stage2: Optional[asyncio.Task] = None
+        if needs_paused_ads:
+            stage2 = asyncio.create_task(self.live_api.get_meta_recently_paused_ads(account_id))
+        elif needs_ad_limit:
+            stage2 = asyncio.create_task(self.live_api.get_meta_active_ads_with_performance(account_id))
+        elif needs_ad_lookup:
+            search_terms = self._extract_search_terms(user_query)
+            logger.info("ad_lookup_triggered", search_terms=search_terms)
+            stage2 = asyncio.create_task(self.live_api.get_meta_ads_by_date_range(
+                account_id=account_id,
+                date_range=date_range,
+                search_terms=search_terms if search_terms else None,
+            ))
 
         # Post the initial loading message
-        thinking_msg = await client.chat_postMessage(
-            channel=channel,
-            thread_ts=reply_ts,
-            text=self._render_status(base_steps, date_range),
-        )
+        try:
+            thinking_msg = await client.chat_postMessage(
+                channel=channel,
+                thread_ts=reply_ts,
+                text=self._render_status(base_steps, date_range),
+            )
+        except Exception:
+            await self._discard_fetch(stage1)
+            if stage2:
+                await self._discard_fetch(stage2)
+            raise
         ts = thinking_msg["ts"]
+        status = _StatusUpdater(
+            functools.partial(self._update_status, client, channel, ts, date_range=date_range)
+        )
 
         def steps_with(updates: dict) -> List[tuple]:
             """Return updated step list with state overrides by label."""
@@ -747,35 +1338,25 @@ class SlackBot:
             # All three fetched in parallel so Jarvis always has the exact
             # active ad count in every response — no guessing or asking.
             try:
-                insights_data, campaign_data, active_count_data = await asyncio.gather(
-                    self.live_api.get_meta_account_insights(
-                        account_id=account_id,
-                        date_range=date_range,
-                        level="account"
-                    ),
-                    self.live_api.get_meta_campaigns(
-                        account_id=account_id,
-                        date_range=date_range
-                    ),
-                    self.live_api.get_meta_active_ads_count(account_id),
-                )
+                insights_data, campaign_data, active_count_data = await stage1
 
                 if insights_data.get("success"):
-                    live_api_context = self.live_api.format_insights_for_context(insights_data)
+                    live_parts = [self.live_api.format_insights_for_context(insights_data)]
                     live_data_success = True
                     if campaign_data.get("success"):
-                        live_api_context += "\n\n" + self.live_api.format_campaigns_for_context(campaign_data)
+                        live_parts.append(self.live_api.format_campaigns_for_context(campaign_data))
 
                     # Always append the real-time active ad count
                     if active_count_data.get("success"):
                         active_count = active_count_data["active_ads"]
                         headroom = 250 - active_count
-                        live_api_context += (
-                            f"\n\n=== ACTIVE AD COUNT (real-time, today) ===\n"
+                        live_parts.append(
+                            f"=== ACTIVE AD COUNT (real-time, today) ===\n"
                             f"Delivering ads right now: {active_count} / 250 limit\n"
                             f"Headroom before limit: {headroom} ads\n"
                             f"Status: {'⚠️ OVER LIMIT' if headroom < 0 else ('🟡 CLOSE TO LIMIT' if headroom < 20 else '🟢 OK')}"
                         )
+                    live_api_context = "\n\n".join(live_parts)
 
                     logger.info(
                         "live_data_fetched_successfully",
@@ -802,168 +1383,75 @@ class SlackBot:
                 )
 
             # Mark stage 1 done, activate next stage
-            if needs_paused_ads:
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Paused ads history": "active",
-                }), date_range)
-            elif needs_ad_limit:
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Active ads inventory": "active",
-                }), date_range)
-            elif needs_ad_lookup:
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Ad-level creative data": "active",
-                }), date_range)
-            else:
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Thinking…": "active",
-                }), date_range)
+            status.schedule(steps_with(_STAGE1_DONE[stage2_step or _STEP_THINKING]))
 
             logger.info("live_data_context_built", has_context=bool(live_api_context), success=live_data_success)
 
             if live_data_success:
                 performance_data = {}
             else:
-                performance_data = self._get_performance_data_from_dashboard()
+                performance_data = await self._get_performance_data_from_dashboard()
 
             # Get thread context
-            ctx = self.get_thread_context(channel, thread_ts)
+            ctx, key = self.get_thread_context(channel, thread_ts)
 
             logger.info(
                 "analysis_context_check",
-                channel=channel,
-                thread_ts=thread_ts,
-                context_key=self.get_thread_key(channel, thread_ts),
-                files_in_context=len(ctx["uploaded_files"]),
-                user_context_items=len(ctx["user_context"]),
+                context_key=key,
+                files_in_context=len(ctx.uploaded_files),
+                user_context_items=len(ctx.user_context),
             )
 
-            # Build additional context from uploaded files and user context
-            additional_context_parts = []
+            # Build additional context from uploaded files and user context.
+            # Live/stage data is prepended later, hence a deque.
+            additional_context_parts: deque = deque()
 
-            if ctx["user_context"]:
+            if ctx.user_context:
                 additional_context_parts.append(
-                    "User-provided context:\n" + "\n".join(f"- {c}" for c in ctx["user_context"])
+                    "User-provided context:\n" + "\n".join(f"- {c}" for c in ctx.user_context)
                 )
 
-            for file_data in ctx["uploaded_files"]:
-                file_type = file_data.get("type", "unknown")
-                filename = file_data.get("filename", "unknown")
-
-                if file_type in ("performance_data", "tabular"):
-                    columns = file_data.get("columns", [])
-                    row_count = file_data.get("row_count", 0)
-                    data = file_data.get("data", [])
-                    additional_context_parts.append(
-                        f"=== UPLOADED FILE: '{filename}' ===\n"
-                        f"Type: {file_type}\n"
-                        f"Columns: {', '.join(columns)}\n"
-                        f"Total rows: {row_count}\n"
-                    )
-                    if data:
-                        if len(data) <= 50:
-                            additional_context_parts.append(f"Complete data:\n{data}")
-                        else:
-                            additional_context_parts.append(f"First 20 rows:\n{data[:20]}")
-                            additional_context_parts.append(f"Last 10 rows:\n{data[-10:]}")
-
-                elif file_type == "spreadsheet":
-                    sheets = file_data.get("sheets", {})
-                    sheet_names = file_data.get("sheet_names", [])
-                    additional_context_parts.append(
-                        f"=== UPLOADED SPREADSHEET: '{filename}' ===\n"
-                        f"Sheets: {', '.join(sheet_names)}\n"
-                    )
-                    for sheet_name, sheet_data in sheets.items():
-                        if sheet_data:
-                            additional_context_parts.append(
-                                f"\n--- Sheet '{sheet_name}' ({len(sheet_data)} rows) ---\n"
-                                f"{sheet_data[:20] if len(sheet_data) > 20 else sheet_data}"
-                            )
-
-                elif file_type == "document":
-                    text_content = file_data.get("text_content", "")
-                    additional_context_parts.append(
-                        f"=== UPLOADED DOCUMENT: '{filename}' ===\n"
-                        f"Format: {file_data.get('format', 'unknown')}\n"
-                        f"Content:\n{text_content[:4000]}"
-                    )
-
-                elif file_type == "json":
-                    json_data = file_data.get("data", {})
-                    additional_context_parts.append(
-                        f"=== UPLOADED JSON: '{filename}' ===\n"
-                        f"Data:\n{json_data}"
-                    )
-
-                elif file_type == "image":
-                    additional_context_parts.append(
-                        f"=== UPLOADED IMAGE: '{filename}' ===\n"
-                        f"Format: {file_data.get('format', 'unknown')}\n"
-                        f"Size: {file_data.get('size_bytes', 0) / 1024:.1f} KB\n"
-                        f"(Image content available for visual analysis)"
-                    )
-
-                else:
-                    additional_context_parts.append(
-                        f"=== UPLOADED FILE: '{filename}' (type: {file_type}) ===\n"
-                        f"Data: {str(file_data)[:2000]}"
-                    )
+            # Newest uploads first, so the context budget drops the oldest
+            if ctx.uploaded_files:
+                additional_context_parts.extend(
+                    await self._render_file_contexts(list(reversed(ctx.uploaded_files)))
+                )
 
             # ── Stage 2a: Paused ads history (change history queries) ────────
             if needs_paused_ads:
                 try:
-                    paused_data = await self.live_api.get_meta_recently_paused_ads(account_id)
+                    paused_data = await stage2
                     if paused_data.get("success"):
                         paused_context = self.live_api.format_paused_ads_for_context(paused_data)
-                        additional_context_parts.insert(0, paused_context)
+                        additional_context_parts.appendleft(paused_context)
                         logger.info("paused_ads_context_injected", ad_count=paused_data.get("total_paused_ads"))
                     else:
                         logger.warning("paused_ads_fetch_failed", error=paused_data.get("error"))
                 except Exception as e:
                     logger.warning("paused_ads_fetch_error", error=str(e))
 
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Paused ads history": "done",
-                    "Thinking…": "active",
-                }), date_range)
+                status.schedule(steps_with(_STAGE2_DONE[_STEP_PAUSED]))
 
             # ── Stage 2b: Active ads inventory (pause/limit queries) ──────────
             elif needs_ad_limit:
                 try:
-                    ad_perf_data = await self.live_api.get_meta_active_ads_with_performance(account_id)
+                    ad_perf_data = await stage2
                     if ad_perf_data.get("success"):
                         ad_perf_context = self.live_api.format_active_ads_for_jarvis(ad_perf_data)
-                        additional_context_parts.insert(0, ad_perf_context)
+                        additional_context_parts.appendleft(ad_perf_context)
                         logger.info("ad_performance_context_injected", ad_count=ad_perf_data.get("total_active_ads"))
                 except Exception as e:
                     logger.warning("ad_performance_fetch_failed", error=str(e))
 
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Active ads inventory": "done",
-                    "Thinking…": "active",
-                }), date_range)
+                status.schedule(steps_with(_STAGE2_DONE[_STEP_INVENTORY]))
 
             # ── Stage 2c: Ad-level creative lookup ────────────────────────────
             elif needs_ad_lookup:
                 try:
-                    search_terms = self._extract_search_terms(user_query)
-                    logger.info("ad_lookup_triggered", search_terms=search_terms)
-
-                    ad_lookup_data = await self.live_api.get_meta_ads_by_date_range(
-                        account_id=account_id,
-                        date_range=date_range,
-                        search_terms=search_terms if search_terms else None,
-                    )
+                    ad_lookup_data = await stage2
                     if ad_lookup_data.get("success"):
                         ad_lookup_context = self.live_api.format_ads_for_context(ad_lookup_data)
-                        additional_context_parts.insert(0, ad_lookup_context)
+                        additional_context_parts.appendleft(ad_lookup_context)
                         logger.info(
                             "ad_lookup_context_injected",
                             ad_count=ad_lookup_data.get("total_ads"),
@@ -974,124 +1462,162 @@ class SlackBot:
                 except Exception as e:
                     logger.warning("ad_lookup_fetch_failed", error=str(e))
 
-                await self._update_status(client, channel, ts, steps_with({
-                    "Account & campaign data": "done",
-                    "Ad-level creative data": "done",
-                    "Thinking…": "active",
-                }), date_range)
+                status.schedule(steps_with(_STAGE2_DONE[_STEP_LOOKUP]))
 
             # Add live API data to context
             if live_api_context:
-                additional_context_parts.insert(0, live_api_context)
+                additional_context_parts.appendleft(live_api_context)
 
-            additional_context = "\n\n".join(additional_context_parts) if additional_context_parts else None
+            additional_context = join_within_budget(
+                additional_context_parts, self.analyst.max_context_chars
+            ) if additional_context_parts else None
 
             # ── Stage 3: AI analysis ──────────────────────────────────────────
             # Pull the clean Q&A history for this specific thread so Jarvis
             # has full conversational context without re-explanation.
             thread_history = self._get_history(ctx)
 
-            analysis = await self.analyst.analyze_performance(
-                performance_data=performance_data,
-                user_query=user_query,
-                additional_context=additional_context,
-                conversation_history=thread_history,
-            )
+            if self._analysis_slots.locked():
+                logger.info("analysis_queued", limit=_MAX_CONCURRENT_ANALYSES)
+            async with self._analysis_slots:
+                analysis = await self.analyst.analyze_performance(
+                    performance_data=performance_data,
+                    user_query=user_query,
+                    additional_context=additional_context,
+                    conversation_history=thread_history,
+                )
 
-            # Store this exchange back into thread history as clean Q&A
-            # (just the raw question + Jarvis's answer — not the data dumps)
-            self._append_history(ctx, user_query, analysis)
-            ctx["last_analysis"] = analysis
+            slack_response, budget_table = await self._record_analysis(ctx, user_query, analysis)
 
-            budget_table = parse_budget_table_from_response(analysis)
-            slack_response = clean_response_for_slack(analysis)
+            # If we have a budget table, generate and upload the CSV in the
+            # background, overlapping the final edit below. The answer
+            # replaces the earlier loading message, so it still reads first.
+            if budget_table:
+                self._spawn(self._upload_budget_csv(client, channel, reply_ts, budget_table))
 
-            # Replace the loading bar with the final answer
+            # Replace the loading bar with the final answer — make sure no
+            # debounced status update can land on top of it
+            await status.settle()
             await client.chat_update(
                 channel=channel,
                 ts=ts,
                 text=slack_response,
             )
-
-            # If we have a budget table, generate and upload CSV
-            if budget_table:
-                markdown_table, csv_buffer = generate_reports(budget_table)
-
-                # Upload CSV as a file
-                csv_bytes = csv_buffer.getvalue().encode("utf-8")
-
-                await client.files_upload_v2(
-                    channel=channel,
-                    thread_ts=reply_ts,
-                    content=csv_bytes,
-                    filename="budget_allocation.csv",
-                    title="Budget Allocation Recommendations",
-                    initial_comment=":chart_with_upwards_trend: Here's the budget allocation as a downloadable CSV:",
-                )
-
-                logger.info("csv_uploaded", channel=channel, rows=len(budget_table))
+            return analysis
 
         except Exception as e:
             logger.error("analysis_error", error=str(e), error_type=type(e).__name__)
+            await self._discard_fetch(stage1)
+            if stage2:
+                await self._discard_fetch(stage2)
+            await status.settle()
             await client.chat_update(
                 channel=channel,
                 ts=ts,
                 text=f":x: Sorry, I encountered an error while analyzing: {str(e)}",
             )
 
-    async def handle_help_command(
+    @staticmethod
+    async def _discard_fetch(fetch: asyncio.Future) -> None:
+        """
+        Abandon a background fetch without leaving its exception unretrieved.
+
+        Finished fetches have their exception (if any) consumed; pending ones
+        are cancelled and awaited so they don't outlive the analysis.
+        """
+        if fetch.done():
+            if not fetch.cancelled():
+                fetch.exception()
+            return
+        fetch.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await fetch
+
+    async def _record_analysis(
         self,
-        client: AsyncWebClient,
-        channel: str,
-        thread_ts: Optional[str],
-    ) -> None:
-        """Send help information to the user."""
-        help_text = """*JARVIS - Paid Media Intelligence* :robot_face:
+        ctx: _ThreadContext,
+        user_query: str,
+        analysis: str,
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """Store an answer in thread history and prepare it for Slack."""
+        # Store this exchange back into thread history as clean Q&A
+        # (just the raw question + Jarvis's answer — not the data dumps)
+        self._append_history(ctx, user_query, analysis)
+        ctx.last_analysis = analysis
 
-At your service. I analyze paid media performance and optimize budget allocation, integrated with the Schumacher Dashboard.
+        return await asyncio.to_thread(parse_and_clean_response, analysis)
 
-*How to engage me:*
-- Mention me with a question: `@Jarvis How should I reallocate the remaining $50k?`
-- Upload files directly - I can process them automatically!
-- Add context: `@Jarvis context: Focus on lead generation this month`
+    def _analysis_key(
+        self,
+        account_id: str,
+        date_range: DateRange,
+        query_lower: str,
+        force_ad_performance: bool,
+        history: Sequence[Dict[str, str]],
+    ) -> str:
+        """
+        Hash the inputs that determine an answer, with whitespace normalized.
 
-*File Processing - I can analyze:* :page_facing_up:
-- *CSV files* - Performance reports, exports from ad platforms
-- *Excel files* (.xlsx, .xls) - Multi-sheet workbooks with data
-- *PDF documents* - Reports, presentations, strategy briefs
-- *Word documents* (.docx) - Briefs, notes, strategy docs
-- *PowerPoint slides* (.pptx) - Presentations and slide decks
-- *Images* (.png, .jpg, .gif) - Screenshots, charts, visuals
-- *Text/Markdown* (.txt, .md) - Notes and documentation
-- *JSON files* - Data exports, API responses
+        The thread's history length and last assistant turn are part of the
+        key, so only requests made against the same conversation share one.
+        """
+        last_answer = next(
+            (turn["content"] for turn in reversed(history) if turn["role"] == "assistant"),
+            "",
+        )
+        raw = "|".join((
+            account_id,
+            str(date_range.start_date),
+            str(date_range.end_date),
+            " ".join(query_lower.split()),
+            "ads" if force_ad_performance else "",
+            str(len(history)),
+        ))
+        digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=16)
+        digest.update(last_answer.encode("utf-8"))
+        return digest.hexdigest()
+
+    async def _upload_budget_csv(
+        self,
+        client: AsyncWebClient,
+        channel: str,
+        reply_ts: str,
+        budget_table: List[Dict[str, Any]],
+    ) -> None:
+        """Generate the budget allocation CSV and upload it to the thread."""
+        try:
+            csv_buffer = await asyncio.to_thread(generate_csv_buffer, budget_table)
 
-Just upload any of these files and I'll automatically extract and analyze the content. Then mention me with your question!
+            # Upload CSV as a file (buffer is already UTF-8 encoded)
+            await client.files_upload_v2(
+                channel=channel,
+                thread_ts=reply_ts,
+                content=csv_buffer.getvalue(),
+                filename="budget_allocation.csv",
+                title="Budget Allocation Recommendations",
+                initial_comment=":chart_with_upwards_trend: Here's the budget allocation as a downloadable CSV:",
+            )
 
-*My capabilities:*
-- Real-time Meta Ads performance analysis with custom date ranges
-- File upload processing and analysis
-- Strategic budget reallocation with reasoning
-- Downloadable CSV reports
-- Contextual memory throughout our conversation
+            logger.info("csv_uploaded", rows=len(budget_table))
+        except Exception as e:
+            logger.error("csv_upload_error", error=str(e), error_type=type(e).__name__)
 
-*Date Ranges I support:* :calendar:
-- "last 7 days", "last 14 days", "last 30 days", "last 60 days", "last 90 days"
-- "this month" or "MTD" (month to date)
-- "last month" (previous calendar month)
-- "YTD" (year to date)
-- Specific months like "January", "February 2026"
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, holding a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
 
-*Example queries:*
-- "Analyze current campaign performance and suggest optimizations"
-- "How did we perform last 7 days?"
-- "Show me January performance data"
-- "Compare MTD vs last month"
-- "How should I split the remaining $25k budget?"
-- "Which campaigns should I pause?"
-- _(upload a file)_ "Analyze this report and identify optimization opportunities"
-"""
+    async def handle_help_command(
+        self,
+        client: AsyncWebClient,
+        channel: str,
+        thread_ts: Optional[str],
+    ) -> None:
+        """Send help information to the user."""
         await client.chat_postMessage(
             channel=channel,
             thread_ts=thread_ts,
-            text=help_text,
+            text=_HELP_TEXT,
         )
@@ -1,49 +1,130 @@
 """File processing module for parsing uploaded performance data files."""
 
+from __future__ import annotations
+
+import asyncio
 import io
-import json
 import base64
-from typing import Any, Dict, List, Optional
+import hashlib
+from collections import OrderedDict
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional, Union
 from pathlib import Path
 
-import pandas as pd
-from docx import Document
-from pypdf import PdfReader
+import orjson
 import structlog
 
+# pandas, python-docx and pypdf are imported by the processors that need
+# them, so the bot starts without paying for parsers it may never use
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = structlog.get_logger(__name__)
 
+# Raw file bytes (or a bytes-like view of them), or a seekable binary
+# stream (e.g. a spooled download)
+FileContent = Union[bytes, bytearray, memoryview, IO[bytes]]
+_BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+def _as_stream(content: FileContent) -> IO[bytes]:
+    """Return a readable binary stream positioned at the start of the file."""
+    if isinstance(content, _BYTES_LIKE):
+        return io.BytesIO(content)
+    content.seek(0)
+    return content
+
+
+# Rows kept as records for a tabular upload: everything for small tables,
+# otherwise just the head and tail that the prompt shows
+_FULL_DATA_MAX_ROWS = 50
+_SAMPLE_HEAD_ROWS = 20
+_SAMPLE_TAIL_ROWS = 10
+
+# Parsed results kept for re-uploads of identical files
+_RESULT_CACHE_MAX_ENTRIES = 32
+_HASH_CHUNK_BYTES = 64 * 1024
+
+
+def _fingerprint(content: FileContent) -> bytes:
+    """Return a BLAKE2b digest of the file contents, reading streams in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(content, _BYTES_LIKE):
+        digest.update(content)
+    else:
+        content.seek(0)
+        for chunk in iter(lambda: content.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _as_bytes(content: FileContent) -> bytes:
+    """Return the full file contents as bytes."""
+    if isinstance(content, _BYTES_LIKE):
+        return bytes(content)
+    content.seek(0)
+    return content.read()
+
 
 class FileProcessor:
     """Process various file formats to extract performance data and context."""
 
-    SUPPORTED_EXTENSIONS = {
-        ".csv", ".xlsx", ".xls", ".pdf", ".docx", ".json",
-        ".pptx",  # PowerPoint
-        ".png", ".jpg", ".jpeg", ".gif", ".webp",  # Images
-        ".txt", ".md",  # Text files
+    # Extension -> processor method name. Shared by all instances and the
+    # single source of truth for SUPPORTED_EXTENSIONS.
+    _PROCESSORS = {
+        ".csv": "_process_csv",
+        ".xlsx": "_process_excel",
+        ".xls": "_process_excel",
+        ".pdf": "_process_pdf",
+        ".docx": "_process_docx",
+        ".json": "_process_json",
+        ".pptx": "_process_pptx",  # PowerPoint
+        ".png": "_process_image",  # Images
+        ".jpg": "_process_image",
+        ".jpeg": "_process_image",
+        ".gif": "_process_image",
+        ".webp": "_process_image",
+        ".txt": "_process_text",  # Text files
+        ".md": "_process_text",
     }
 
-    def __init__(self):
-        """Initialize the file processor."""
-        self._processors = {
-            ".csv": self._process_csv,
-            ".xlsx": self._process_excel,
-            ".xls": self._process_excel,
-            ".pdf": self._process_pdf,
-            ".docx": self._process_docx,
-            ".json": self._process_json,
-            ".pptx": self._process_pptx,
-            ".png": self._process_image,
-            ".jpg": self._process_image,
-            ".jpeg": self._process_image,
-            ".gif": self._process_image,
-            ".webp": self._process_image,
-            ".txt": self._process_text,
-            ".md": self._process_text,
-        }
+    SUPPORTED_EXTENSIONS = frozenset(_PROCESSORS)
+
+    # Normalized column names that mark an upload as ad performance data
+    _PERFORMANCE_COLUMNS = frozenset({
+        "spend", "cost", "budget", "impressions", "clicks",
+        "conversions", "cpa", "cpc", "roas", "revenue",
+        "campaign", "ad_set", "adset", "ad_group", "platform"
+    })
 
-    def can_process(self, filename: str) -> bool:
+    def __init__(
+        self,
+        max_text_chars: Optional[int] = None,
+        include_summary: bool = True,
+    ):
+        """
+        Initialize the file processor.
+
+        Args:
+            max_text_chars: Stop extracting document text (PDF, DOCX, PPTX,
+                plain text) once this many characters are collected.
+                None keeps the full text.
+            include_summary: Build the text "summary" for tabular, spreadsheet
+                and JSON results. When False the key is None, which skips
+                the per-column statistics pass.
+        """
+        self.max_text_chars = max_text_chars
+        self.include_summary = include_summary
+        # (content digest, extension) -> parsed result, in LRU order
+        self._results: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+    def _cap_text(self, text: str) -> str:
+        """Trim extracted text to max_text_chars, if set."""
+        if self.max_text_chars is None:
+            return text
+        return text[:self.max_text_chars]
+
+    @classmethod
+    def can_process(cls, filename: str) -> bool:
         """
         Check if a file can be processed.
 
@@ -54,18 +135,18 @@ class FileProcessor:
             True if the file type is supported.
         """
         ext = Path(filename).suffix.lower()
-        return ext in self.SUPPORTED_EXTENSIONS
+        return ext in cls.SUPPORTED_EXTENSIONS
 
     async def process_file(
         self,
-        file_content: bytes,
+        file_content: FileContent,
         filename: str,
     ) -> Dict[str, Any]:
         """
         Process an uploaded file and extract relevant data.
 
         Args:
-            file_content: Raw bytes of the file.
+            file_content: Raw bytes of the file, or a seekable binary stream.
             filename: Name of the file for determining type.
 
         Returns:
@@ -73,22 +154,42 @@ class FileProcessor:
         """
         ext = Path(filename).suffix.lower()
 
-        if ext not in self._processors:
+        if ext not in self._PROCESSORS:
             raise ValueError(f"Unsupported file type: {ext}")
 
+        # Re-uploads of the same report skip parsing entirely, even when the
+        # file comes back under a different name (e.g. a forwarded PDF)
+        cache_key = (await asyncio.to_thread(_fingerprint, file_content), ext)
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            self._results.move_to_end(cache_key)
+            logger.info("file_processed_from_cache", filename=filename)
+            # Shallow copy: callers annotate their record, the parsed data is shared
+            return dict(cached, filename=filename)
+
         logger.info("processing_file", filename=filename, extension=ext)
 
-        processor = self._processors[ext]
-        result = await processor(file_content, filename)
+        # Parsers are synchronous and CPU-bound (pandas, pypdf, python-docx);
+        # run them in a worker thread so the bot keeps serving other events
+        processor = getattr(self, self._PROCESSORS[ext])
+        result = await asyncio.to_thread(processor, file_content, filename)
 
         logger.info("file_processed", filename=filename, data_type=result.get("type"))
 
+        if result.get("type") != "error":
+            self._results[cache_key] = result
+            while len(self._results) > _RESULT_CACHE_MAX_ENTRIES:
+                self._results.popitem(last=False)
+            result = dict(result)
+
         return result
 
-    async def _process_csv(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_csv(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a CSV file."""
+        import pandas as pd
+
         try:
-            df = pd.read_csv(io.BytesIO(content))
+            df = pd.read_csv(_as_stream(content))
             return self._dataframe_to_result(df, filename, "csv")
         except Exception as e:
             logger.error("csv_processing_error", filename=filename, error=str(e))
@@ -98,23 +199,35 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_excel(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_excel(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process an Excel file."""
+        import pandas as pd
+
         try:
-            # Read all sheets
-            excel_file = pd.ExcelFile(io.BytesIO(content))
             sheets = {}
 
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                sheets[sheet_name] = df.to_dict(orient="records")
+            row_counts = {}
+
+            # Read all sheets, one at a time; the workbook is closed on exit
+            with pd.ExcelFile(_as_stream(content)) as excel_file:
+                sheet_names = excel_file.sheet_names
+                for sheet_name in sheet_names:
+                    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+                    # Only the leading rows are ever shown, so don't dict-ify the rest
+                    sheets[sheet_name] = df.head(_SAMPLE_HEAD_ROWS).to_dict(orient="records")
+                    row_counts[sheet_name] = len(df)
+                    # Free this sheet before the next one is parsed
+                    del df
 
             return {
                 "type": "spreadsheet",
                 "filename": filename,
                 "sheets": sheets,
-                "sheet_names": excel_file.sheet_names,
-                "summary": self._generate_spreadsheet_summary(sheets),
+                "sheet_names": sheet_names,
+                "sheet_row_counts": row_counts,
+                "summary": (
+                    self._generate_spreadsheet_summary(row_counts) if self.include_summary else None
+                ),
             }
         except Exception as e:
             logger.error("excel_processing_error", filename=filename, error=str(e))
@@ -124,19 +237,14 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_pdf(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_pdf(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a PDF file."""
+        from pypdf import PdfReader
+
         try:
-            reader = PdfReader(io.BytesIO(content))
-            text_content = []
-
-            for page_num, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text:
-                    text_content.append({
-                        "page": page_num + 1,
-                        "content": text.strip(),
-                    })
+            # Lenient parsing: don't fail (or re-validate) on minor spec violations
+            reader = PdfReader(_as_stream(content), strict=False)
+            text_content = self._extract_pdf_pages(reader)
 
             full_text = "\n\n".join([p["content"] for p in text_content])
 
@@ -156,27 +264,52 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_docx(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _extract_pdf_pages(self, reader: Any) -> List[Dict[str, Any]]:
+        """Extract page texts in order, stopping once max_text_chars is reached."""
+        text_content = []
+        limit = self.max_text_chars
+        extracted = 0
+
+        for page_num, page in enumerate(reader.pages):
+            # Text extraction is the expensive part; skip pages past the cap
+            if limit is not None and extracted >= limit:
+                break
+            text = page.extract_text()
+            if text:
+                text = text.strip()
+                extracted += len(text)
+                text_content.append({
+                    "page": page_num + 1,
+                    "content": text,
+                })
+
+        return text_content
+
+    def _process_docx(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a DOCX file."""
+        from docx import Document
+
         try:
-            doc = Document(io.BytesIO(content))
-            paragraphs = [para.text for para in doc.paragraphs if para.text.strip()]
+            doc = Document(_as_stream(content))
+            # Paragraph.text rebuilds the string from XML on each access; read it once
+            paragraphs = [text for text in (para.text for para in doc.paragraphs) if text.strip()]
+            text = self._cap_text("\n\n".join(paragraphs))
 
             # Extract tables if present
-            tables = []
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text for cell in row.cells]
-                    table_data.append(row_data)
-                if table_data:
-                    tables.append(table_data)
+            tables = [
+                table_data
+                for table_data in (
+                    [[cell.text for cell in row.cells] for row in table.rows]
+                    for table in doc.tables
+                )
+                if table_data
+            ]
 
             return {
                 "type": "document",
                 "filename": filename,
                 "format": "docx",
-                "text_content": "\n\n".join(paragraphs),
+                "text_content": text,
                 "paragraph_count": len(paragraphs),
                 "tables": tables,
                 "table_count": len(tables),
@@ -189,16 +322,26 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_json(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_json(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a JSON file."""
         try:
-            data = json.loads(content.decode("utf-8"))
+            # orjson parses straight from bytes, no intermediate str
+            data = orjson.loads(_as_bytes(content))
+
+            # Arrays of records (ad platform exports) are tables: go columnar
+            # and keep only the sampled rows instead of the whole object tree
+            if isinstance(data, list) and data and all(isinstance(row, dict) for row in data):
+                import pandas as pd
+
+                df = pd.DataFrame.from_records(data)
+                del data
+                return self._dataframe_to_result(df, filename, "json")
 
             return {
                 "type": "json",
                 "filename": filename,
                 "data": data,
-                "summary": self._generate_json_summary(data),
+                "summary": self._generate_json_summary(data) if self.include_summary else None,
             }
         except Exception as e:
             logger.error("json_processing_error", filename=filename, error=str(e))
@@ -215,15 +358,21 @@ class FileProcessor:
         format_type: str,
     ) -> Dict[str, Any]:
         """Convert a DataFrame to a result dictionary."""
-        # Detect if this looks like performance data
-        performance_columns = {
-            "spend", "cost", "budget", "impressions", "clicks",
-            "conversions", "cpa", "cpc", "roas", "revenue",
-            "campaign", "ad_set", "adset", "ad_group", "platform"
-        }
-
-        columns_lower = {col.lower().replace(" ", "_") for col in df.columns}
-        is_performance_data = bool(columns_lower & performance_columns)
+        # Detect if this looks like performance data (stops at the first match)
+        is_performance_data = any(
+            str(col).lower().replace(" ", "_") in self._PERFORMANCE_COLUMNS
+            for col in df.columns
+        )
+
+        # Convert only the rows the prompt can show; large tables keep a
+        # head + tail sample instead of one dict per row
+        if len(df) <= _FULL_DATA_MAX_ROWS:
+            data = df.to_dict(orient="records")
+        else:
+            data = (
+                df.head(_SAMPLE_HEAD_ROWS).to_dict(orient="records")
+                + df.tail(_SAMPLE_TAIL_ROWS).to_dict(orient="records")
+            )
 
         return {
             "type": "performance_data" if is_performance_data else "tabular",
@@ -231,8 +380,8 @@ class FileProcessor:
             "format": format_type,
             "columns": list(df.columns),
             "row_count": len(df),
-            "data": df.to_dict(orient="records"),
-            "summary": self._generate_dataframe_summary(df),
+            "data": data,
+            "summary": self._generate_dataframe_summary(df) if self.include_summary else None,
             "is_performance_data": is_performance_data,
         }
 
@@ -247,16 +396,19 @@ class FileProcessor:
         numeric_cols = df.select_dtypes(include=["number"]).columns
         if len(numeric_cols) > 0:
             lines.append("\nNumeric Summary:")
-            for col in numeric_cols[:5]:  # Limit to first 5
-                lines.append(f"  {col}: min={df[col].min():.2f}, max={df[col].max():.2f}, mean={df[col].mean():.2f}")
+            # One vectorized pass over the first 5 columns instead of 3 per column
+            stats = df[numeric_cols[:5]].agg(["min", "max", "mean"])
+            for col in stats.columns:
+                col_min, col_max, col_mean = stats[col]
+                lines.append(f"  {col}: min={col_min:.2f}, max={col_max:.2f}, mean={col_mean:.2f}")
 
         return "\n".join(lines)
 
-    def _generate_spreadsheet_summary(self, sheets: Dict[str, List]) -> str:
+    def _generate_spreadsheet_summary(self, row_counts: Dict[str, int]) -> str:
         """Generate a summary for a multi-sheet spreadsheet."""
-        lines = [f"Sheets: {len(sheets)}"]
-        for name, data in sheets.items():
-            lines.append(f"  - {name}: {len(data)} rows")
+        lines = [f"Sheets: {len(row_counts)}"]
+        for name, count in row_counts.items():
+            lines.append(f"  - {name}: {count} rows")
         return "\n".join(lines)
 
     def _generate_json_summary(self, data: Any) -> str:
@@ -268,24 +420,30 @@ class FileProcessor:
         else:
             return f"Value of type {type(data).__name__}"
 
-    async def _process_pptx(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_pptx(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a PowerPoint file."""
         try:
             from pptx import Presentation
 
-            prs = Presentation(io.BytesIO(content))
+            prs = Presentation(_as_stream(content))
             slides_content = []
+            limit = self.max_text_chars
+            extracted = 0
 
             for slide_num, slide in enumerate(prs.slides, 1):
+                if limit is not None and extracted >= limit:
+                    break
                 slide_text = []
                 for shape in slide.shapes:
                     if hasattr(shape, "text") and shape.text.strip():
                         slide_text.append(shape.text.strip())
 
                 if slide_text:
+                    joined = "\n".join(slide_text)
+                    extracted += len(joined)
                     slides_content.append({
                         "slide": slide_num,
-                        "content": "\n".join(slide_text),
+                        "content": joined,
                     })
 
             full_text = "\n\n---\n\n".join([
@@ -316,9 +474,10 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_image(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_image(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process an image file - store as base64 for potential vision analysis."""
         try:
+            content = _as_bytes(content)
             ext = Path(filename).suffix.lower()
             mime_types = {
                 ".png": "image/png",
@@ -349,9 +508,11 @@ class FileProcessor:
                 "error": str(e),
             }
 
-    async def _process_text(self, content: bytes, filename: str) -> Dict[str, Any]:
+    def _process_text(self, content: FileContent, filename: str) -> Dict[str, Any]:
         """Process a plain text or markdown file."""
         try:
+            content = _as_bytes(content)
+
             # Try UTF-8 first, then fallback to latin-1
             try:
                 text = content.decode("utf-8")
@@ -364,7 +525,7 @@ class FileProcessor:
                 "type": "document",
                 "filename": filename,
                 "format": "markdown" if ext == ".md" else "text",
-                "text_content": text,
+                "text_content": self._cap_text(text),
                 "line_count": len(text.splitlines()),
                 "char_count": len(text),
             }
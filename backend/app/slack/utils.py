@@ -6,66 +6,231 @@ import csv
 import io
 import json
 import re
-from typing import Any, List, Dict, Optional, Tuple
+from typing import Any, Iterable, List, Dict, Optional, Tuple
 
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
 
-def parse_budget_table_from_response(response_text: str) -> Optional[List[Dict[str, Any]]]:
+
+def _dumps(obj: Any) -> bytes:
+    # Fall back to str() for values orjson can't encode (e.g. pandas Timestamps)
+    return orjson.dumps(obj, default=str, option=_JSON_OPTIONS)
+
+
+def to_json_text(obj: Any) -> str:
     """
-    Extract the budget allocation table from an analysis response.
+    Serialize data to compact JSON for inclusion in a prompt.
+
+    Args:
+        obj: Data to serialize (rows, parsed JSON uploads, etc.).
+
+    Returns:
+        A compact JSON string.
+    """
+    return _dumps(obj).decode("utf-8")
 
-    The AI is instructed to format budget tables as JSON in a code block
-    labeled ```budget_table```.
+
+def truncated_json(obj: Any, cap: int) -> str:
+    """
+    Serialize data to compact JSON, stopping once `cap` bytes have been produced.
+
+    Top-level dicts and lists are encoded one item at a time, so a large
+    payload is never fully stringified just to keep its first few KB.
 
     Args:
-        response_text: The full response text from the AI analyst.
+        obj: Data to serialize.
+        cap: Maximum size of the output in bytes.
 
     Returns:
-        List of budget allocation dictionaries, or None if not found.
+        A JSON string of at most `cap` bytes (truncated output is not valid JSON).
     """
-    # Look for the budget_table code block
-    pattern = r"```budget_table\s*\n(.*?)\n```"
-    match = re.search(pattern, response_text, re.DOTALL)
+    if isinstance(obj, dict):
+        items = (_dumps(str(k)) + b":" + _dumps(v) for k, v in obj.items())
+        opener, closer = b"{", b"}"
+    elif isinstance(obj, (list, tuple)):
+        items = (_dumps(v) for v in obj)
+        opener, closer = b"[", b"]"
+    else:
+        return _dumps(obj)[:cap].decode("utf-8", errors="ignore")
 
-    if match:
-        try:
-            table_json = match.group(1).strip()
-            data = json.loads(table_json)
+    buffer = bytearray(opener)
+    for i, item in enumerate(items):
+        if i:
+            buffer += b","
+        buffer += item
+        if len(buffer) >= cap:
+            break
+    else:
+        buffer += closer
 
-            if isinstance(data, list):
-                logger.info("budget_table_parsed", row_count=len(data))
-                return data
-            else:
-                logger.warning("budget_table_not_list", data_type=type(data).__name__)
-                return None
+    return buffer[:cap].decode("utf-8", errors="ignore")
+
+
+_WORD_RE = re.compile(r"(\S+)(\s*)")
 
-        except json.JSONDecodeError as e:
-            logger.error("budget_table_json_error", error=str(e))
+
+def truncate_text(text: str, limit: int) -> str:
+    """
+    Trim document text to a prompt budget, spending it on words rather than whitespace.
+
+    Runs of whitespace are collapsed (to a newline if they contain one, else
+    a space) and the cut falls on a word boundary, so extracted PDF/DOCX
+    text full of layout padding packs more real content under the same cap.
+
+    Args:
+        text: Extracted document text.
+        limit: Maximum length of the result in characters.
+
+    Returns:
+        The compacted, truncated text.
+    """
+    kept: List[str] = []
+    size = 0
+    for match in _WORD_RE.finditer(text):
+        word, space = match.groups()
+        if size + len(word) > limit:
+            if not kept:
+                # A single oversized token; hard-cut it instead of returning nothing
+                kept.append(word[:limit])
+            break
+        kept.append(word)
+        kept.append("\n" if "\n" in space else " ")
+        size += len(word) + 1
+    return "".join(kept).rstrip()
+
+
+def join_within_budget(parts: Iterable[str], budget: int, sep: str = "\n\n") -> str:
+    """
+    Join context parts in order, stopping once a character budget is reached.
+
+    The part that crosses the budget is cut back to the last line break that
+    fits, so leading parts (live data) keep whole rows and the result never
+    exceeds the budget; parts after it are dropped.
+
+    Args:
+        parts: Context blocks in priority order.
+        budget: Maximum length of the joined string, in characters.
+        sep: Separator placed between parts.
+
+    Returns:
+        The joined string.
+    """
+    kept = []
+    size = 0
+    dropped = 0
+    for part in parts:
+        overhead = len(sep) if kept else 0
+        remaining = budget - size - overhead
+        if remaining <= 0:
+            dropped += 1
+            continue
+        if len(part) > remaining:
+            cut = part.rfind("\n", 0, remaining)
+            part = part[:cut if cut > 0 else remaining]
+            logger.warning("context_part_truncated", budget=budget)
+        kept.append(part)
+        size += overhead + len(part)
+
+    if dropped:
+        logger.warning("context_parts_dropped", dropped=dropped, budget=budget)
+
+    return sep.join(kept)
+
+
+_BUDGET_BLOCK_RE = re.compile(r"```budget_table\s*\n(.*?)\n```", re.DOTALL)
+_BUDGET_TABLE_COLUMNS = frozenset({"Platform", "Campaign/Tactic", "Reasoning"})
+_JSON_DECODER = json.JSONDecoder()
+_EXTRA_NEWLINES_RE = re.compile(r"\n{3,}")
+_DOUBLE_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+
+def _budget_table_from_block(match: re.Match) -> Optional[List[Dict[str, Any]]]:
+    """Parse the JSON inside a ```budget_table``` block."""
+    try:
+        table_json = match.group(1).strip()
+        data = orjson.loads(table_json)
+
+        if isinstance(data, list):
+            logger.info("budget_table_parsed", row_count=len(data))
+            return data
+        else:
+            logger.warning("budget_table_not_list", data_type=type(data).__name__)
             return None
 
-    # Fallback: Try to find any JSON array that looks like a budget table
-    json_pattern = r"\[[\s\S]*?\{[\s\S]*?\"Platform\"[\s\S]*?\}[\s\S]*?\]"
-    json_match = re.search(json_pattern, response_text)
+    except orjson.JSONDecodeError as e:
+        logger.error("budget_table_json_error", error=str(e))
+        return None
+
+
+def _budget_table_fallback(response_text: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Find a bare JSON array that looks like a budget table.
 
-    if json_match:
-        try:
-            data = json.loads(json_match.group(0))
-            if isinstance(data, list) and len(data) > 0:
+    Decodes from each '[' in turn rather than using a nested lazy regex,
+    so long responses can't trigger pathological backtracking.
+    """
+    if '"Platform"' in response_text:
+        find = response_text.find
+        start = find("[")
+        while start != -1:
+            try:
+                data, end = _JSON_DECODER.raw_decode(response_text, start)
+            except (json.JSONDecodeError, RecursionError):
+                start = find("[", start + 1)
+                continue
+
+            if (
+                isinstance(data, list)
+                and data
+                and isinstance(data[0], dict)
                 # Verify it has expected columns
-                expected_cols = {"Platform", "Campaign/Tactic", "Reasoning"}
-                if expected_cols.issubset(set(data[0].keys())):
-                    logger.info("budget_table_parsed_fallback", row_count=len(data))
-                    return data
-        except json.JSONDecodeError:
-            pass
+                and _BUDGET_TABLE_COLUMNS.issubset(data[0].keys())
+            ):
+                logger.info("budget_table_parsed_fallback", row_count=len(data))
+                return data
+            start = find("[", end)
 
     logger.warning("no_budget_table_found")
     return None
 
 
+def _format_for_slack(text: str) -> str:
+    """Collapse blank-line runs and convert **bold** to Slack's *bold*."""
+    # Remove any duplicate newlines
+    cleaned = _EXTRA_NEWLINES_RE.sub("\n\n", text)
+
+    # Ensure bold markers work in Slack (** -> *)
+    # Slack uses single asterisks for bold
+    cleaned = _DOUBLE_BOLD_RE.sub(r"*\1*", cleaned)
+
+    return cleaned.strip()
+
+
+def parse_budget_table_from_response(response_text: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract the budget allocation table from an analysis response.
+
+    The AI is instructed to format budget tables as JSON in a code block
+    labeled ```budget_table```.
+
+    Args:
+        response_text: The full response text from the AI analyst.
+
+    Returns:
+        List of budget allocation dictionaries, or None if not found.
+    """
+    match = _BUDGET_BLOCK_RE.search(response_text)
+    if match:
+        return _budget_table_from_block(match)
+
+    # Fallback: Try to find any JSON array that looks like a budget table
+    return _budget_table_fallback(response_text)
+
+
 def clean_response_for_slack(response_text: str) -> str:
     """
     Clean and format the response text for Slack display.
@@ -79,17 +244,33 @@ def clean_response_for_slack(response_text: str) -> str:
     Returns:
         Cleaned response suitable for Slack.
     """
-    # Remove the budget_table code block
-    cleaned = re.sub(r"```budget_table\s*\n.*?\n```", "", response_text, flags=re.DOTALL)
+    return _format_for_slack(_BUDGET_BLOCK_RE.sub("", response_text))
 
-    # Remove any duplicate newlines
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
 
-    # Ensure bold markers work in Slack (** -> *)
-    # Slack uses single asterisks for bold
-    cleaned = re.sub(r"\*\*(.+?)\*\*", r"*\1*", cleaned)
+def parse_and_clean_response(
+    response_text: str,
+) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+    """
+    Extract the budget table and clean the response for Slack in one pass.
 
-    return cleaned.strip()
+    Equivalent to calling clean_response_for_slack and
+    parse_budget_table_from_response, but the budget_table block is located
+    once and reused for both.
+
+    Args:
+        response_text: The full response text from the AI analyst.
+
+    Returns:
+        Tuple of (cleaned Slack text, budget table rows or None).
+    """
+    match = _BUDGET_BLOCK_RE.search(response_text)
+    if match is None:
+        return _format_for_slack(response_text), _budget_table_fallback(response_text)
+
+    budget_table = _budget_table_from_block(match)
+    # Only the text after the first block can hold further blocks to strip
+    stripped = response_text[:match.start()] + _BUDGET_BLOCK_RE.sub("", response_text[match.end():])
+    return _format_for_slack(stripped), budget_table
 
 
 def format_markdown_table(data: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> str:
@@ -114,46 +295,59 @@ def format_markdown_table(data: List[Dict[str, Any]], columns: Optional[List[str
     header = "| " + " | ".join(columns) + " |"
     separator = "| " + " | ".join(["---"] * len(columns)) + " |"
 
-    # Build rows
-    rows = []
+    # Write rows straight into one buffer, no intermediate list of lines
+    buffer = io.StringIO()
+    write = buffer.write
+    write(header)
+    write("\n")
+    write(separator)
     for row in data:
-        row_values = [str(row.get(col, "")) for col in columns]
-        rows.append("| " + " | ".join(row_values) + " |")
+        write("\n| ")
+        write(" | ".join([str(row.get(col, "")) for col in columns]))
+        write(" |")
 
-    return "\n".join([header, separator] + rows)
+    return buffer.getvalue()
 
 
-def generate_csv_buffer(data: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> io.StringIO:
+def generate_csv_buffer(data: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> io.BytesIO:
     """
-    Convert a list of dictionaries to a CSV buffer.
+    Convert a list of dictionaries to a UTF-8 encoded CSV buffer.
+
+    The CSV is encoded as it is written, so no intermediate str copy of the
+    whole file is ever built.
 
     Args:
         data: List of dictionaries containing the data rows.
         columns: Optional list of column names. If not provided, uses keys from first row.
 
     Returns:
-        A StringIO buffer containing the CSV data.
+        A BytesIO buffer containing the UTF-8 encoded CSV data.
     """
-    if not data:
-        buffer = io.StringIO()
-        buffer.write("No data available")
-        buffer.seek(0)
-        return buffer
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
 
-    # Determine columns
-    if columns is None:
-        columns = list(data[0].keys())
-
-    buffer = io.StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
-    writer.writeheader()
-    writer.writerows(data)
+    if not data:
+        text.write("No data available")
+    else:
+        # Determine columns
+        if columns is None:
+            columns = list(data[0].keys())
+
+        # Plain writer over projected rows: same output as DictWriter with
+        # extrasaction="ignore", minus its per-row key validation
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        writer.writerows([row.get(col, "") for col in columns] for row in data)
+
+    # Detach so the wrapper doesn't close the underlying buffer
+    text.flush()
+    text.detach()
     buffer.seek(0)
 
     return buffer
 
 
-def generate_reports(data: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> Tuple[str, io.StringIO]:
+def generate_reports(data: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> Tuple[str, io.BytesIO]:
     """
     Generate both Markdown table and CSV buffer from analysis data.
 
@@ -0,0 +1,71 @@
+"""Tests for FileProcessor row sampling and the parsed-result cache."""
+
+import asyncio
+
+from app.slack.file_processor import FileProcessor
+
+
+def _csv(rows: int) -> bytes:
+    lines = ["campaign,spend"] + [f"Campaign {i},{i}" for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def test_small_table_keeps_every_row():
+    result = asyncio.run(FileProcessor().process_file(_csv(50), "report.csv"))
+
+    assert result["row_count"] == 50
+    assert len(result["data"]) == 50
+
+
+def test_large_table_keeps_head_and_tail_sample():
+    result = asyncio.run(FileProcessor().process_file(_csv(500), "report.csv"))
+
+    assert result["row_count"] == 500
+    names = [row["campaign"] for row in result["data"]]
+    assert names == [f"Campaign {i}" for i in list(range(20)) + list(range(490, 500))]
+
+
+def test_reupload_reuses_parsed_result():
+    processor = FileProcessor()
+
+    async def upload_twice():
+        first = await processor.process_file(_csv(5), "report.csv")
+        second = await processor.process_file(_csv(5), "forwarded.csv")
+        return first, second
+
+    first, second = asyncio.run(upload_twice())
+
+    # Cache hits are shallow copies that share the parsed rows, even when
+    # the same file comes back under another name
+    assert second["data"] is first["data"]
+    assert first["filename"] == "report.csv"
+    assert second["filename"] == "forwarded.csv"
+
+
+def test_cache_key_includes_extension():
+    processor = FileProcessor()
+    content = b"campaign,spend\nBrand,10\n"
+
+    async def upload_as_two_types():
+        as_csv = await processor.process_file(content, "report.csv")
+        as_text = await processor.process_file(content, "report.txt")
+        return as_csv, as_text
+
+    as_csv, as_text = asyncio.run(upload_as_two_types())
+
+    assert as_csv["format"] == "csv"
+    assert as_text["type"] != as_csv["type"]
+
+
+def test_changed_file_is_parsed_again():
+    processor = FileProcessor()
+
+    async def upload_two_versions():
+        first = await processor.process_file(_csv(5), "report.csv")
+        second = await processor.process_file(_csv(6), "report.csv")
+        return first, second
+
+    first, second = asyncio.run(upload_two_versions())
+
+    assert len(first["data"]) == 5
+    assert len(second["data"]) == 6
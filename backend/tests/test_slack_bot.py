@@ -0,0 +1,73 @@
+"""Tests for SlackBot analysis coalescing."""
+
+import asyncio
+
+from app.slack.bot import SlackBot
+
+
+class _FakeClient:
+    """Records chat_postMessage calls instead of talking to Slack."""
+
+    def __init__(self):
+        self.posted = []
+
+    async def chat_postMessage(self, **kwargs):
+        self.posted.append(kwargs)
+        return {"ok": True}
+
+
+async def _make_bot(monkeypatch, answer="Spend is up 12%."):
+    bot = SlackBot(
+        slack_bot_token="xoxb-test",
+        slack_signing_secret="secret",
+        slack_app_token="xapp-test",
+        anthropic_api_key="sk-test",
+    )
+    calls = []
+
+    async def fake_fresh_analysis(client, channel, thread_ts, user_query, **kwargs):
+        calls.append(user_query)
+        await asyncio.sleep(0.05)
+        return answer
+
+    monkeypatch.setattr(bot, "_run_fresh_analysis", fake_fresh_analysis)
+    return bot, calls
+
+
+def test_identical_concurrent_requests_share_one_analysis(monkeypatch):
+    async def scenario():
+        bot, calls = await _make_bot(monkeypatch)
+        client = _FakeClient()
+        try:
+            await asyncio.gather(*(
+                bot._run_analysis(client, "C1", "100.1", "how is spend this month?", ts, False)
+                for ts in ("100.2", "100.3")
+            ))
+        finally:
+            await bot.aclose()
+        return calls, client
+
+    calls, client = asyncio.run(scenario())
+
+    assert calls == ["how is spend this month?"]
+    # The coalesced request still gets its own reply in the thread
+    assert [post["thread_ts"] for post in client.posted] == ["100.1"]
+
+
+def test_different_requests_are_not_coalesced(monkeypatch):
+    async def scenario():
+        bot, calls = await _make_bot(monkeypatch)
+        client = _FakeClient()
+        try:
+            await asyncio.gather(
+                bot._run_analysis(client, "C1", "100.1", "how is spend this month?", "100.2", False),
+                bot._run_analysis(client, "C1", "100.1", "how is spend last week?", "100.3", False),
+            )
+        finally:
+            await bot.aclose()
+        return calls
+
+    assert sorted(asyncio.run(scenario())) == [
+        "how is spend last week?",
+        "how is spend this month?",
+    ]
@@ -0,0 +1,46 @@
+"""Tests for the prompt budget helpers in app.slack.utils."""
+
+import json
+
+from app.slack.utils import join_within_budget, truncated_json
+
+
+def test_truncated_json_small_payload_is_valid_json():
+    data = {"spend": 12.5, "campaigns": [{"name": "Brand"}]}
+
+    assert json.loads(truncated_json(data, 1024)) == data
+
+
+def test_truncated_json_respects_cap():
+    rows = [{"ad_name": f"Ad {i}", "spend": i * 1.5} for i in range(1000)]
+
+    for cap in (1, 64, 1000, 4096):
+        assert len(truncated_json(rows, cap).encode("utf-8")) <= cap
+
+
+def test_truncated_json_keeps_leading_items():
+    rows = [{"ad_name": f"Ad {i}"} for i in range(1000)]
+
+    assert truncated_json(rows, 200).startswith('[{"ad_name":"Ad 0"},{"ad_name":"Ad 1"}')
+
+
+def test_join_within_budget_keeps_everything_that_fits():
+    assert join_within_budget(["a", "b", "c"], 100) == "a\n\nb\n\nc"
+
+
+def test_join_within_budget_never_exceeds_budget():
+    parts = ["\n".join(f"row {i} of part {p}" for i in range(50)) for p in range(5)]
+
+    for budget in (1, 10, 100, 1000, 5000):
+        assert len(join_within_budget(parts, budget)) <= budget
+
+
+def test_join_within_budget_cuts_at_line_break():
+    parts = ["header", "row 1\nrow 2\nrow 3"]
+
+    # "header" + separator leave room for "row 1\nrow" only
+    assert join_within_budget(parts, 17) == "header\n\nrow 1"
+
+
+def test_join_within_budget_drops_parts_after_budget():
+    assert join_within_budget(["first", "second"], 6) == "first"